@@ -10,6 +10,33 @@ import subprocess
 from pathlib import Path
 
 
+PAUSE_TIMEOUT = 30.0  # 秒
+
+
+def pause(prompt="Press Enter to exit..."):
+    """等待用户按回车，非交互环境直接返回，交互环境最多等待PAUSE_TIMEOUT秒"""
+    print(prompt, end="", flush=True)
+    
+    if not sys.stdin or not sys.stdin.isatty():
+        print()
+        return
+    
+    if sys.platform == "win32":
+        import msvcrt
+        import time
+        deadline = time.monotonic() + PAUSE_TIMEOUT
+        while time.monotonic() < deadline:
+            if msvcrt.kbhit() and msvcrt.getwch() in ("\r", "\n"):
+                break
+            time.sleep(0.05)
+    else:
+        import select
+        ready, _, _ = select.select([sys.stdin], [], [], PAUSE_TIMEOUT)
+        if ready:
+            sys.stdin.readline()
+    print()
+
+
 def main():
     """主启动函数"""
     try:
@@ -56,7 +83,7 @@ def main():
         if result.returncode != 0:
             print("\n❌ Environment check failed")
             print("💡 Please check the error messages above")
-            input("\nPress Enter to exit...")
+            pause("\nPress Enter to exit...")
             return result.returncode
         
         print("\n✅ Environment check completed")
@@ -90,12 +117,14 @@ def main():
                     print("⚠️  GUI failed to start, trying CLI version...")
                     print()
                     
-                    # 启动命令行版本
+                    # 启动命令行版本（最后一步，POSIX下直接替换启动器进程）
+                    if os.name == "posix":
+                        exec_script(python_cmd, "universal_downloader.py")  # 仅在exec失败时返回
                     result = subprocess.run([python_cmd, "universal_downloader.py"])
                     return result.returncode
         except Exception as e:
             print(f"❌ Failed to start application: {e}")
-            input("\nPress Enter to exit...")
+            pause("\nPress Enter to exit...")
             return 1
         
         print("\n👋 Thank you for using Universal Video Downloader")
@@ -106,10 +135,21 @@ def main():
         return 0
     except Exception as e:
         print(f"\n❌ Startup error: {e}")
-        input("\nPress Enter to exit...")
+        pause("\nPress Enter to exit...")
         return 1
 
 
+def exec_script(python_cmd, script):
+    """用os.execv以当前进程运行脚本，省去一次解释器启动；失败时返回False"""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execv(python_cmd, [python_cmd, script])
+    except OSError as e:
+        print(f"⚠️  Failed to exec {script}: {e}")
+    return False
+
+
 def check_python_version():
     """检查Python版本"""
     version = sys.version_info
@@ -121,7 +161,7 @@ def check_python_version():
         print("   1. Install Python 3.8 or higher")
         print("   2. Download from https://python.org")
         print()
-        input("Press Enter to exit...")
+        pause()
         return False
     
     print(f"✓ Python {version.major}.{version.minor}.{version.micro} detected")
@@ -5,11 +5,13 @@ Clean, Beautiful, Fully Functional
 """
 
 import sys
-import os
 import threading
-import time
+import traceback
+from concurrent.futures import as_completed
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict
+from urllib.parse import urlsplit
 
 try:
     from PySide6.QtWidgets import *
@@ -21,86 +23,157 @@ except ImportError:
     print("❌ PySide6 not available. Please install: uv pip install PySide6")
 
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+URL_PREFIXES = ('http://', 'https://')
+
+# 域名 -> 平台显示名称
+PLATFORM_NAMES = {
+    "youtube.com": "YouTube",
+    "youtu.be": "YouTube",
+    "tiktok.com": "TikTok",
+    "twitter.com": "Twitter/X",
+    "x.com": "Twitter/X",
+    "instagram.com": "Instagram",
+    "pornhub.com": "PornHub",
+}
+
+# 平台 -> 打开文件夹的命令，其余平台使用 xdg-open
+FOLDER_OPENERS = {
+    "win32": "explorer",
+    "darwin": "open",
+}
+
+
+# 全局样式表，在QApplication上设置一次，按objectName/属性区分控件
+APP_STYLESHEET = """
+    * {
+        background-color: #F5F5F7;
+    }
+
+    #headerTitle { color: #1D1D1F; }
+    #headerSubtitle { color: #86868B; }
+
+    QTextEdit#urlInput {
+        background-color: #FFFFFF;
+        border: 2px solid #E5E5E7;
+        border-radius: 12px;
+        padding: 12px;
+        color: #1D1D1F;
+    }
+    QTextEdit#urlInput:focus {
+        border-color: #007AFF;
+    }
+
+    QWidget#statusCard {
+        background-color: #FFFFFF;
+        border: 1px solid #E5E5E7;
+        border-radius: 12px;
+    }
+    QLabel#statusTitle {
+        color: #1D1D1F;
+        background-color: transparent;
+    }
+    QLabel#statusDetail {
+        color: #86868B;
+        background-color: transparent;
+    }
+    QProgressBar#progressBar {
+        background-color: #E5E5EA;
+        border: 1px solid #D1D1D6;
+        border-radius: 5px;
+        text-align: center;
+        color: #1D1D1F;
+        font-size: 10px;
+    }
+    QProgressBar#progressBar::chunk {
+        background-color: #007AFF;
+        border-radius: 4px;
+    }
+
+    QPushButton[buttonType] {
+        border: none;
+        border-radius: 10px;
+        font-weight: 500;
+        padding: 8px 16px;
+    }
+    QPushButton[buttonType="primary"] {
+        background-color: #007AFF;
+        color: white;
+        font-weight: 600;
+        padding: 10px 20px;
+    }
+    QPushButton[buttonType="primary"]:hover { background-color: #0056CC; }
+    QPushButton[buttonType="primary"]:pressed { background-color: #004499; }
+    QPushButton[buttonType="danger"] {
+        background-color: #FF3B30;
+        color: white;
+    }
+    QPushButton[buttonType="danger"]:hover { background-color: #E6342A; }
+    QPushButton[buttonType="warning"] {
+        background-color: #FF9500;
+        color: white;
+    }
+    QPushButton[buttonType="warning"]:hover { background-color: #E6850E; }
+    QPushButton[buttonType="success"] {
+        background-color: #34C759;
+        color: white;
+    }
+    QPushButton[buttonType="success"]:hover { background-color: #2FB344; }
+    QPushButton[buttonType="secondary"] {
+        background-color: #FFFFFF;
+        border: 1px solid #D1D1D6;
+        color: #007AFF;
+    }
+    QPushButton[buttonType="secondary"]:hover {
+        background-color: #F2F2F7;
+        border-color: #007AFF;
+    }
+    QPushButton[buttonType]:disabled {
+        background-color: #C7C7CC;
+        color: #8E8E93;
+    }
+"""
+
+
+@lru_cache(maxsize=None)
+def app_font(size: int, weight=None) -> "QFont":
+    """返回共享的界面字体（需在QApplication创建后调用）"""
+    if weight is None:
+        return QFont("Segoe UI", size)
+    return QFont("Segoe UI", size, weight)
+
+
 class PerfectAppleButton(QPushButton):
-    """完美的Apple风格按钮"""
+    """完美的Apple风格按钮（样式见APP_STYLESHEET中的buttonType选择器）"""
     
     def __init__(self, text: str, button_type: str = "secondary"):
         super().__init__(text)
         self.button_type = button_type
+        self.setProperty("buttonType", button_type)
         self.setMinimumHeight(36)
-        self.setFont(QFont("Segoe UI", 11, QFont.Weight.Medium))
+        self.setFont(app_font(11, QFont.Weight.Medium))
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        self._apply_style()
-    
-    def _apply_style(self):
-        """应用按钮样式"""
-        base_style = """
-            QPushButton {
-                border: none;
-                border-radius: 10px;
-                font-weight: 500;
-                padding: 8px 16px;
-            }
-            QPushButton:disabled {
-                background-color: #C7C7CC;
-                color: #8E8E93;
-            }
-        """
-        
-        if self.button_type == "primary":
-            style = base_style + """
-                QPushButton {
-                    background-color: #007AFF;
-                    color: white;
-                    font-weight: 600;
-                    padding: 10px 20px;
-                }
-                QPushButton:hover { background-color: #0056CC; }
-                QPushButton:pressed { background-color: #004499; }
-            """
-        elif self.button_type == "danger":
-            style = base_style + """
-                QPushButton {
-                    background-color: #FF3B30;
-                    color: white;
-                }
-                QPushButton:hover { background-color: #E6342A; }
-            """
-        elif self.button_type == "warning":
-            style = base_style + """
-                QPushButton {
-                    background-color: #FF9500;
-                    color: white;
-                }
-                QPushButton:hover { background-color: #E6850E; }
-            """
-        elif self.button_type == "success":
-            style = base_style + """
-                QPushButton {
-                    background-color: #34C759;
-                    color: white;
-                }
-                QPushButton:hover { background-color: #2FB344; }
-            """
-        else:  # secondary
-            style = base_style + """
-                QPushButton {
-                    background-color: #FFFFFF;
-                    border: 1px solid #D1D1D6;
-                    color: #007AFF;
-                }
-                QPushButton:hover {
-                    background-color: #F2F2F7;
-                    border-color: #007AFF;
-                }
-            """
-        
-        self.setStyleSheet(style)
+
+
+class DownloadRunnable(QRunnable):
+    """在QThreadPool的常驻线程中执行下载工作函数"""
+
+    def __init__(self, worker, *args):
+        super().__init__()
+        self._worker = worker
+        self._args = args
+
+    def run(self):
+        self._worker(*self._args)
 
 
 class PerfectAppleDownloader(QMainWindow):
     """完美的Apple风格视频下载器"""
     
+    # 进度轮询间隔（毫秒），约10Hz
+    PROGRESS_POLL_MS = 100
+    
     # 信号定义
     progress_updated = Signal(str, float, str)
     download_completed = Signal(bool, str)
@@ -112,6 +185,23 @@ class PerfectAppleDownloader(QMainWindow):
         self.is_downloading = False
         self.is_paused = False
         self.current_task_id = None
+        self._resume_event = threading.Event()  # 未暂停时处于set状态
+        self._resume_event.set()
+        
+        # URL解析缓存，文本未变化时不重复解析
+        self._cached_text = ""
+        self._cached_urls: List[str] = []
+        
+        # task_id -> 显示用标题，进度回调中直接读取
+        self._titles: Dict[str, str] = {}
+        
+        # 上次显示的 (标题, 进度, 详情)，未变化的部分不再刷新
+        self._last_status = (None, None, None)
+        
+        # 下载期间在主线程定时读取下载器的进度事件
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(self.PROGRESS_POLL_MS)
+        self._progress_timer.timeout.connect(self._poll_progress)
         
         # 初始化下载器
         self.init_downloader()
@@ -150,10 +240,14 @@ class PerfectAppleDownloader(QMainWindow):
 
     def init_downloader(self):
         """初始化下载器"""
+        # 下载目录只计算一次，使用绝对路径，避免在下载线程中切换工作目录
+        self._downloads_dir = SCRIPT_DIR / "downloads"
+        self._downloads_dir.mkdir(exist_ok=True)
+
         try:
             from universal_downloader import DownloadManager
             self.downloader = DownloadManager(max_workers=4)
-            self.downloader.add_progress_callback(self._on_download_progress)
+            self.downloader.add_info_ready_callback(self._on_info_ready)
             self.downloader_available = True
             print("✅ Downloader initialized successfully")
         except Exception as e:
@@ -164,19 +258,10 @@ class PerfectAppleDownloader(QMainWindow):
     def init_ui(self):
         """初始化用户界面"""
         self.setWindowTitle("Arina AV Downloader")
+        self.setStyleSheet(APP_STYLESHEET)
         self.setMinimumSize(600, 500)
         self.resize(700, 600)
         
-        # 设置窗口背景色
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #F5F5F7;
-            }
-            * {
-                background-color: #F5F5F7;
-            }
-        """)
-        
         # 主窗口部件
         main_widget = QWidget()
         main_widget.setAutoFillBackground(True)
@@ -198,33 +283,29 @@ class PerfectAppleDownloader(QMainWindow):
     
     def create_header(self, layout):
         """创建标题区域"""
-        header_widget = QWidget()
-        header_widget.setStyleSheet("background-color: #F5F5F7;")
-        header_layout = QVBoxLayout(header_widget)
+        header_layout = QVBoxLayout()
         header_layout.setSpacing(6)
         
         # 主标题
         title = QLabel("🎬 Video Downloader")
-        title.setFont(QFont("Segoe UI", 28, QFont.Weight.Bold))
+        title.setFont(app_font(28, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: #1D1D1F; background-color: #F5F5F7;")
+        title.setObjectName("headerTitle")
         
         # 副标题
         subtitle = QLabel("Simple • Fast • Beautiful")
-        subtitle.setFont(QFont("Segoe UI", 16))
+        subtitle.setFont(app_font(16))
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle.setStyleSheet("color: #86868B; background-color: #F5F5F7;")
+        subtitle.setObjectName("headerSubtitle")
         
         header_layout.addWidget(title)
         header_layout.addWidget(subtitle)
         
-        layout.addWidget(header_widget)
+        layout.addLayout(header_layout)
     
     def create_url_input(self, layout):
         """创建URL输入区域"""
-        input_widget = QWidget()
-        input_widget.setStyleSheet("background-color: #F5F5F7;")
-        input_layout = QVBoxLayout(input_widget)
+        input_layout = QVBoxLayout()
         input_layout.setSpacing(12)
         
         # URL输入框
@@ -235,20 +316,14 @@ class PerfectAppleDownloader(QMainWindow):
         )
         self.url_input.setMaximumHeight(120)
         self.url_input.setMinimumHeight(100)
-        self.url_input.setFont(QFont("Segoe UI", 13))
-        self.url_input.setStyleSheet("""
-            QTextEdit {
-                background-color: #FFFFFF;
-                border: 2px solid #E5E5E7;
-                border-radius: 12px;
-                padding: 12px;
-                color: #1D1D1F;
-            }
-            QTextEdit:focus {
-                border-color: #007AFF;
-            }
-        """)
-        self.url_input.textChanged.connect(self.on_url_changed)
+        self.url_input.setFont(app_font(13))
+        self.url_input.setObjectName("urlInput")
+        # 合并连续的文本变化（如粘贴大量URL），只解析一次
+        self._url_change_timer = QTimer(self)
+        self._url_change_timer.setSingleShot(True)
+        self._url_change_timer.setInterval(50)
+        self._url_change_timer.timeout.connect(self.on_url_changed)
+        self.url_input.textChanged.connect(self._url_change_timer.start)
         
         # 按钮布局
         button_layout = QHBoxLayout()
@@ -267,19 +342,13 @@ class PerfectAppleDownloader(QMainWindow):
         input_layout.addWidget(self.url_input)
         input_layout.addLayout(button_layout)
         
-        layout.addWidget(input_widget)
+        layout.addLayout(input_layout)
     
     def create_status_section(self, layout):
         """创建状态显示区域"""
         status_widget = QWidget()
         status_widget.setFixedHeight(100)
-        status_widget.setStyleSheet("""
-            QWidget {
-                background-color: #FFFFFF;
-                border: 1px solid #E5E5E7;
-                border-radius: 12px;
-            }
-        """)
+        status_widget.setObjectName("statusCard")
         
         status_layout = QVBoxLayout(status_widget)
         status_layout.setContentsMargins(20, 16, 20, 16)
@@ -287,8 +356,8 @@ class PerfectAppleDownloader(QMainWindow):
         
         # 状态标题
         self.status_title = QLabel("Ready to Download")
-        self.status_title.setFont(QFont("Segoe UI", 16, QFont.Weight.Medium))
-        self.status_title.setStyleSheet("color: #1D1D1F; background-color: transparent;")
+        self.status_title.setFont(app_font(16, QFont.Weight.Medium))
+        self.status_title.setObjectName("statusTitle")
         self.status_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # 进度条
@@ -296,25 +365,12 @@ class PerfectAppleDownloader(QMainWindow):
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.progress_bar.setFixedHeight(10)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                background-color: #E5E5EA;
-                border: 1px solid #D1D1D6;
-                border-radius: 5px;
-                text-align: center;
-                color: #1D1D1F;
-                font-size: 10px;
-            }
-            QProgressBar::chunk {
-                background-color: #007AFF;
-                border-radius: 4px;
-            }
-        """)
+        self.progress_bar.setObjectName("progressBar")
         
         # 状态详情
         self.status_detail = QLabel("Paste URLs and click Download")
-        self.status_detail.setFont(QFont("Segoe UI", 12))
-        self.status_detail.setStyleSheet("color: #86868B; background-color: transparent;")
+        self.status_detail.setFont(app_font(12))
+        self.status_detail.setObjectName("statusDetail")
         self.status_detail.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         status_layout.addWidget(self.status_title)
@@ -325,9 +381,7 @@ class PerfectAppleDownloader(QMainWindow):
 
     def create_controls(self, layout):
         """创建控制按钮区域"""
-        controls_widget = QWidget()
-        controls_widget.setStyleSheet("background-color: #F5F5F7;")
-        controls_layout = QVBoxLayout(controls_widget)
+        controls_layout = QVBoxLayout()
         controls_layout.setSpacing(12)
 
         # 主要操作按钮
@@ -373,7 +427,7 @@ class PerfectAppleDownloader(QMainWindow):
         controls_layout.addLayout(main_controls)
         controls_layout.addLayout(control_layout)
 
-        layout.addWidget(controls_widget)
+        layout.addLayout(controls_layout)
 
     def center_window(self):
         """居中窗口"""
@@ -384,10 +438,10 @@ class PerfectAppleDownloader(QMainWindow):
             (screen.height() - size.height()) // 2
         )
 
+    @Slot()
     def on_url_changed(self):
         """URL输入变化处理"""
-        text = self.url_input.toPlainText().strip()
-        urls = self._extract_urls(text)
+        urls = self._current_urls()
 
         has_urls = len(urls) > 0 and self.downloader_available
         self.download_btn.setEnabled(has_urls and not self.is_downloading)
@@ -402,6 +456,14 @@ class PerfectAppleDownloader(QMainWindow):
         else:
             self.update_status("Ready to Download", 0, "Paste URLs and click Download")
 
+    def _current_urls(self) -> List[str]:
+        """返回输入框中的URL（按文本内容缓存）"""
+        text = self.url_input.toPlainText().strip()
+        if text != self._cached_text:
+            self._cached_text = text
+            self._cached_urls = self._extract_urls(text)
+        return self._cached_urls
+
     def _extract_urls(self, text: str) -> List[str]:
         """从文本中提取有效URL"""
         if not text:
@@ -412,52 +474,71 @@ class PerfectAppleDownloader(QMainWindow):
 
         for line in lines:
             line = line.strip()
-            if line and (line.startswith('http://') or line.startswith('https://')):
+            if line.startswith(URL_PREFIXES):
                 urls.append(line)
 
         return urls
 
     def _detect_platform(self, url: str) -> str:
         """检测URL平台"""
-        url_lower = url.lower()
-        if "youtube.com" in url_lower or "youtu.be" in url_lower:
-            return "YouTube"
-        elif "tiktok.com" in url_lower:
-            return "TikTok"
-        elif "twitter.com" in url_lower or "x.com" in url_lower:
-            return "Twitter/X"
-        elif "instagram.com" in url_lower:
-            return "Instagram"
-        elif "pornhub.com" in url_lower:
-            return "PornHub"
-        else:
+        try:
+            host = urlsplit(url).hostname or ""
+        except ValueError:
             return "Web"
 
+        # 依次尝试完整域名及其父域名，如 m.youtube.com -> youtube.com
+        while host:
+            name = PLATFORM_NAMES.get(host)
+            if name:
+                return name
+            _, _, host = host.partition(".")
+        return "Web"
+
     def update_status(self, title: str, progress: float, detail: str):
         """更新状态显示"""
-        self.status_title.setText(title)
-        self.progress_bar.setValue(int(progress))
-        self.status_detail.setText(detail)
+        status = (title, int(progress), detail)
+        last_title, last_progress, last_detail = self._last_status
+        if status == self._last_status:
+            return
+        self._last_status = status
+
+        if title != last_title:
+            self.status_title.setText(title)
+        if status[1] != last_progress:
+            self.progress_bar.setValue(status[1])
+        if detail != last_detail:
+            self.status_detail.setText(detail)
 
+    @Slot()
     def paste_url(self):
         """粘贴URL"""
-        clipboard = QApplication.clipboard()
-        text = clipboard.text().strip()
-        if text:
-            current_text = self.url_input.toPlainText().strip()
-            if current_text:
-                self.url_input.setPlainText(current_text + '\n' + text)
-            else:
-                self.url_input.setPlainText(text)
+        text = QApplication.clipboard().text().strip()
+        if not text:
+            return
+
+        # 在末尾追加，避免整体重设文本导致全文重新排版
+        cursor = self.url_input.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.url_input.document().isEmpty():
+            text = '\n' + text
 
+        self.url_input.blockSignals(True)
+        cursor.insertText(text)
+        self.url_input.blockSignals(False)
+        self.url_input.setTextCursor(cursor)
+        self.on_url_changed()
+
+    @Slot()
     def clear_urls(self):
         """清空URL"""
         self.url_input.clear()
 
+    @Slot()
     def start_download(self):
         """开始视频下载"""
         self._start_download_process(audio_only=False)
 
+    @Slot()
     def download_audio(self):
         """开始音频下载"""
         self._start_download_process(audio_only=True)
@@ -468,8 +549,7 @@ class PerfectAppleDownloader(QMainWindow):
             QMessageBox.warning(self, "Error", "Downloader not available. Please check installation.")
             return
 
-        text = self.url_input.toPlainText().strip()
-        urls = self._extract_urls(text)
+        urls = self._current_urls()
 
         if not urls:
             QMessageBox.warning(self, "Error", "Please enter at least one valid URL")
@@ -482,10 +562,16 @@ class PerfectAppleDownloader(QMainWindow):
         # 更新状态
         self.is_downloading = True
         self.is_paused = False
+        self._resume_event.set()
+        self._titles.clear()
 
         # 更新UI
         self._update_ui_for_download_start()
 
+        # 丢弃上一次下载残留的进度事件，开始轮询
+        self.downloader.drain_progress_events()
+        self._progress_timer.start()
+
         # 开始下载
         download_type = "Audio" if audio_only else "Video"
         if len(urls) == 1:
@@ -494,31 +580,38 @@ class PerfectAppleDownloader(QMainWindow):
             self.update_status(f"Starting Batch {download_type} Download...", 5, f"Processing {len(urls)} URLs...")
 
         # 在后台线程中执行下载
-        threading.Thread(target=self._download_worker, args=(urls, audio_only), daemon=True).start()
+        QThreadPool.globalInstance().start(DownloadRunnable(self._download_worker, urls, audio_only))
 
+    @Slot()
     def pause_download(self):
         """暂停下载"""
         if self.is_downloading and not self.is_paused:
             self.is_paused = True
+            self._resume_event.clear()
             self.pause_btn.setEnabled(False)
             self.resume_btn.setEnabled(True)
             current_progress = self.progress_bar.value()
             self.update_status("Download Paused", current_progress, "Click Resume to continue")
 
+    @Slot()
     def resume_download(self):
         """恢复下载"""
         if self.is_downloading and self.is_paused:
             self.is_paused = False
+            self._resume_event.set()
             self.pause_btn.setEnabled(True)
             self.resume_btn.setEnabled(False)
             current_progress = self.progress_bar.value()
             self.update_status("Resuming Download...", current_progress, "Download resumed")
 
+    @Slot()
     def stop_download(self):
         """停止下载"""
         if self.is_downloading:
             self.is_downloading = False
             self.is_paused = False
+            self._resume_event.set()
+            self._progress_timer.stop()
 
             # 尝试停止下载器中的任务
             if hasattr(self, 'downloader') and self.current_task_id:
@@ -547,8 +640,7 @@ class PerfectAppleDownloader(QMainWindow):
 
     def _update_ui_for_download_end(self):
         """更新UI为下载结束状态"""
-        text = self.url_input.toPlainText().strip()
-        urls = self._extract_urls(text)
+        urls = self._current_urls()
         has_urls = len(urls) > 0 and self.downloader_available
 
         self.download_btn.setEnabled(has_urls)
@@ -560,13 +652,7 @@ class PerfectAppleDownloader(QMainWindow):
     def _download_worker(self, urls: List[str], audio_only: bool):
         """并发下载工作线程"""
         try:
-            # 确保在正确的目录
-            os.chdir(Path(__file__).parent)
-
-            # 创建下载目录
-            downloads_dir = Path("./downloads")
-            downloads_dir.mkdir(exist_ok=True)
-
+            downloads_dir = self._downloads_dir
             total_urls = len(urls)
 
             if total_urls == 1:
@@ -580,12 +666,6 @@ class PerfectAppleDownloader(QMainWindow):
             print(f"Download worker error: {e}")
             self.download_completed.emit(False, f"Download error: {str(e)}")
 
-        finally:
-            # 重置下载状态
-            self.is_downloading = False
-            self.is_paused = False
-            self.current_task_id = None
-
     def _download_single(self, url: str, downloads_dir: Path, audio_only: bool):
         """单个下载 - 实时进度显示"""
         try:
@@ -600,75 +680,37 @@ class PerfectAppleDownloader(QMainWindow):
             task_id = self.downloader.add_task(url, str(downloads_dir), audio_only=audio_only)
             self.current_task_id = task_id
 
-            # 获取视频信息
-            task = self.downloader.get_task_status(task_id)
-            if task and task.title:
-                title = task.title[:35] + "..." if len(task.title) > 35 else task.title
-                self.progress_updated.emit(
-                    f"Starting: {title}",
-                    5,
-                    "Preparing download..."
-                )
-
-            # 开始下载 - 不阻塞，让进度回调处理更新
+            # 开始下载 - 不阻塞，进度由回调更新（标题由_on_info_ready填入），完成时回调通知
             future = self.downloader.start_download(task_id)
+            future.add_done_callback(partial(self._on_single_download_done, task_id))
 
-            # 监控下载进度
-            start_time = time.time()
-            last_progress = 0
-
-            while not future.done():
-                if not self.is_downloading:
-                    break
-
-                # 等待暂停恢复
-                while self.is_paused and self.is_downloading:
-                    time.sleep(0.5)
-
-                if not self.is_downloading:
-                    break
-
-                # 检查任务状态
-                current_task = self.downloader.get_task_status(task_id)
-                if current_task:
-                    current_progress = current_task.progress
-
-                    # 如果进度没有通过回调更新，手动更新
-                    if current_progress > last_progress:
-                        last_progress = current_progress
-                        elapsed = time.time() - start_time
-
-                        if current_task.title:
-                            title = current_task.title[:35] + "..." if len(current_task.title) > 35 else current_task.title
-                        else:
-                            title = "Downloading..."
-
-                        self.progress_updated.emit(
-                            title,
-                            current_progress,
-                            f"Progress: {current_progress:.1f}% | Time: {elapsed:.0f}s"
-                        )
-
-                time.sleep(0.5)  # 每0.5秒检查一次
+        except Exception as e:
+            print(f"Single download error: {e}")
+            self.download_completed.emit(False, f"Download error: {str(e)}")
 
-            # 获取最终结果
-            success = future.result(timeout=10)  # 短超时，因为已经完成
-
-            if success:
-                self.progress_updated.emit(
-                    "Download Complete!",
-                    100,
-                    "File saved successfully"
-                )
-                message = "Download completed successfully!"
-                self.download_completed.emit(True, message)
-            else:
-                message = "Download failed. Please check the URL and try again."
-                self.download_completed.emit(False, message)
+    def _on_single_download_done(self, task_id: str, future):
+        """单个下载完成回调（在下载线程中执行）"""
+        if not self.is_downloading or task_id != self.current_task_id:
+            return  # 已被手动停止，或已开始新的下载
 
+        try:
+            success = future.result()
         except Exception as e:
             print(f"Single download error: {e}")
             self.download_completed.emit(False, f"Download error: {str(e)}")
+            return
+
+        if success:
+            self.progress_updated.emit(
+                "Download Complete!",
+                100,
+                "File saved successfully"
+            )
+            message = "Download completed successfully!"
+            self.download_completed.emit(True, message)
+        else:
+            message = "Download failed. Please check the URL and try again."
+            self.download_completed.emit(False, message)
 
     def _download_concurrent(self, urls: List[str], downloads_dir: Path, audio_only: bool):
         """并发下载多个URL"""
@@ -684,6 +726,10 @@ class PerfectAppleDownloader(QMainWindow):
                 "Initializing concurrent downloads..."
             )
 
+            add_task = self.downloader.add_task
+            start_download = self.downloader.start_download
+            output_dir = str(downloads_dir)
+
             for i, url in enumerate(urls):
                 if not self.is_downloading:
                     break
@@ -693,16 +739,13 @@ class PerfectAppleDownloader(QMainWindow):
                     print(f"Adding task {i+1}/{total_urls}: {platform}")
 
                     # 添加下载任务
-                    task_id = self.downloader.add_task(url, str(downloads_dir), audio_only=audio_only)
+                    task_id = add_task(url, output_dir, audio_only=audio_only)
                     task_ids.append(task_id)
 
                     # 开始下载（不等待完成）
-                    future = self.downloader.start_download(task_id)
+                    future = start_download(task_id)
                     futures.append((task_id, future, url))
 
-                    # 小延迟避免过快启动
-                    time.sleep(0.2)
-
                 except Exception as e:
                     print(f"Failed to add task {i+1}: {e}")
 
@@ -716,21 +759,21 @@ class PerfectAppleDownloader(QMainWindow):
                 "Concurrent downloads in progress..."
             )
 
-            # 等待所有下载完成
-            for i, (task_id, future, url) in enumerate(futures):
+            # 按完成顺序处理下载结果
+            future_to_url = {future: url for task_id, future, url in futures}
+            for i, future in enumerate(as_completed(future_to_url)):
                 if not self.is_downloading:
                     break
 
                 # 等待暂停恢复
-                while self.is_paused and self.is_downloading:
-                    time.sleep(0.5)
+                self._resume_event.wait()
 
                 if not self.is_downloading:
                     break
 
+                url = future_to_url[future]
                 try:
-                    # 等待这个任务完成
-                    success = future.result(timeout=600)
+                    success = future.result()
 
                     if success:
                         completed += 1
@@ -760,60 +803,73 @@ class PerfectAppleDownloader(QMainWindow):
             print(f"Concurrent download error: {e}")
             self.download_completed.emit(False, f"Concurrent download error: {str(e)}")
 
-    def _on_download_progress(self, task_id: str, progress: float, speed: float):
-        """下载进度回调（线程安全）- 增强版"""
+    @Slot()
+    def _poll_progress(self):
+        """读取下载器积累的进度事件（主线程定时器），只显示最新的一条"""
+        events = self.downloader.drain_progress_events()
+        if not events or not self.is_downloading or self.is_paused:
+            return
+
+        task_id, progress, speed = events[-1]
+
         try:
-            def update_progress():
-                if self.is_downloading and not self.is_paused:
-                    # 格式化速度显示
-                    if speed > 0:
-                        speed_mb = speed / 1024 / 1024
-                        if speed_mb >= 1:
-                            speed_text = f"{speed_mb:.1f} MB/s"
-                        else:
-                            speed_kb = speed / 1024
-                            speed_text = f"{speed_kb:.1f} KB/s"
-                    else:
-                        speed_text = "Connecting..."
-
-                    # 获取任务信息
-                    title = "Downloading..."
-                    if hasattr(self, 'downloader') and self.downloader:
-                        task = self.downloader.get_task_status(task_id)
-                        if task and hasattr(task, 'title') and task.title:
-                            title = task.title[:35] + "..." if len(task.title) > 35 else task.title
-
-                    # 确保进度在合理范围内
-                    progress = max(0, min(100, progress))
-
-                    # 添加下载阶段信息
-                    if progress < 1:
-                        detail = f"Initializing... | {speed_text}"
-                    elif progress < 5:
-                        detail = f"Starting download... | {speed_text}"
-                    elif progress >= 99:
-                        detail = f"Finalizing... | {speed_text}"
-                    else:
-                        detail = f"Downloading {progress:.1f}% | {speed_text}"
+            # 格式化速度显示
+            if speed > 0:
+                speed_mb = speed / 1024 / 1024
+                if speed_mb >= 1:
+                    speed_text = f"{speed_mb:.1f} MB/s"
+                else:
+                    speed_kb = speed / 1024
+                    speed_text = f"{speed_kb:.1f} KB/s"
+            else:
+                speed_text = "Connecting..."
 
-                    # 更新状态
-                    self.update_status(title, progress, detail)
+            # 获取任务信息
+            title = self._titles.get(task_id, "Downloading...")
 
-                    # 调试输出
-                    print(f"Progress: {progress:.1f}% | Speed: {speed_text} | Task: {task_id[:8]}")
+            # 确保进度在合理范围内
+            progress = max(0, min(100, progress))
 
-            # 在主线程中执行更新
-            QTimer.singleShot(0, update_progress)
+            # 添加下载阶段信息
+            if progress < 1:
+                detail = f"Initializing... | {speed_text}"
+            elif progress < 5:
+                detail = f"Starting download... | {speed_text}"
+            elif progress >= 99:
+                detail = f"Finalizing... | {speed_text}"
+            else:
+                detail = f"Downloading {progress:.1f}% | {speed_text}"
+
+            # 定时器已在主线程中，直接更新状态
+            self.update_status(title, progress, detail)
+
+            # 调试输出
+            print(f"Progress: {progress:.1f}% | Speed: {speed_text} | Task: {task_id[:8]}")
 
         except Exception as e:
-            print(f"Progress callback error: {e}")
+            print(f"Progress update error: {e}")
+
+    def _on_info_ready(self, task_id: str, info: dict):
+        """视频信息获取完成回调（在下载器线程中执行）"""
+        title = info.get('title')
+        if title:
+            self._titles[task_id] = title[:35] + "..." if len(title) > 35 else title
 
+    @Slot(str, float, str)
     def on_progress_updated(self, title: str, progress: float, detail: str):
         """处理进度更新信号（主线程）"""
         self.update_status(title, progress, detail)
 
+    @Slot(bool, str)
     def on_download_completed(self, success: bool, message: str):
         """处理下载完成信号（主线程）"""
+        # 重置下载状态
+        self.is_downloading = False
+        self.is_paused = False
+        self._resume_event.set()
+        self.current_task_id = None
+        self._progress_timer.stop()
+
         # 重置UI状态
         self._update_ui_for_download_end()
 
@@ -825,24 +881,22 @@ class PerfectAppleDownloader(QMainWindow):
             self.update_status("Download Failed", 0, "Check error details")
             QMessageBox.warning(self, "Error", message)
 
+    @Slot()
     def open_downloads_folder(self):
         """打开下载文件夹"""
-        downloads_path = Path("./downloads")
+        downloads_path = self._downloads_dir
         downloads_path.mkdir(exist_ok=True)
 
-        import subprocess
-        try:
-            if sys.platform == "win32":
-                subprocess.run(["explorer", str(downloads_path)], shell=True)
-            elif sys.platform == "darwin":
-                subprocess.run(["open", str(downloads_path)])
-            else:
-                subprocess.run(["xdg-open", str(downloads_path)])
-        except Exception as e:
+        # 分离启动文件管理器，不阻塞界面线程
+        opener = FOLDER_OPENERS.get(sys.platform, "xdg-open")
+        result = QProcess.startDetached(opener, [str(downloads_path)])
+        started = result[0] if isinstance(result, tuple) else result
+
+        if not started:
             QMessageBox.information(
                 self,
                 "Downloads Folder",
-                f"Downloads are saved to:\n{downloads_path.absolute()}\n\nCould not open folder automatically: {e}"
+                f"Downloads are saved to:\n{downloads_path.absolute()}\n\nCould not open folder automatically: failed to start {opener}"
             )
 
 
@@ -870,7 +924,6 @@ def main():
 
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         return 1
 
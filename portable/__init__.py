@@ -9,14 +9,6 @@ Apple式设计理念：
 - 用户友好体验
 """
 
-from .env_checker import EnvChecker
-from .path_manager import PathManager
-from .dep_manager import DependencyManager
-from .config_manager import ConfigManager
-from .error_handler import ErrorHandler, global_error_handler
-from .welcome_wizard import WelcomeWizard
-from .maintenance import MaintenanceManager, global_maintenance_manager
-
 __version__ = "1.0.0"
 __author__ = "Universal Video Downloader Team"
 
@@ -26,9 +18,39 @@ __all__ = [
     'PathManager', 
     'DependencyManager',
     'ConfigManager',
+    'get_config_manager',
     'ErrorHandler',
     'WelcomeWizard',
     'MaintenanceManager',
     'global_error_handler',
     'global_maintenance_manager'
-]
\ No newline at end of file
+]
+
+# 导出名称 -> 所在子模块；首次访问时才导入（导入 portable.path_manager 等子模块时
+# 不会连带加载全部模块和创建全局维护管理器）
+_LAZY_EXPORTS = {
+    'EnvChecker': 'env_checker',
+    'PathManager': 'path_manager',
+    'DependencyManager': 'dep_manager',
+    'ConfigManager': 'config_manager',
+    'get_config_manager': 'config_manager',
+    'ErrorHandler': 'error_handler',
+    'global_error_handler': 'error_handler',
+    'WelcomeWizard': 'welcome_wizard',
+    'MaintenanceManager': 'maintenance',
+    'global_maintenance_manager': 'maintenance',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,13 +3,118 @@
 Apple式设计：智能配置，自动修复，优雅降级
 """
 
+import copy
 import json
 import os
+import re
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
 from .models import ErrorInfo, ProjectStructure
 from .path_manager import PathManager
-from .utils import get_friendly_error_message, print_progress
+from .utils import get_friendly_error_message, print_progress, loads_json, dumps_json, atomic_write_bytes
+
+# 配置必需字段（元组保持报告顺序，集合用于一次性检查）
+REQUIRED_CONFIG_FIELDS = (
+    "max_workers",
+    "default_output_dir",
+    "default_quality",
+    "default_format",
+    "platforms"
+)
+_REQUIRED_FIELD_SET = frozenset(REQUIRED_CONFIG_FIELDS)
+_ERR_MISSING_FIELD_FMT = "配置缺少必需字段: {}"
+
+# JSON中以绝对路径开头的字符串: "/...  "\\...  "C:\\...  "C:/...
+_ABS_PATH_VALUE_RE = re.compile(rb'"(?:/|\\\\|[A-Za-z]:(?:\\\\|/))')
+
+# 默认配置（模块级常量，只构建一次；使用时深拷贝）
+_DEFAULT_CONFIG_DATA = {
+    "max_workers": 4,
+    "default_output_dir": "./downloads",
+    "default_quality": "best",
+    "default_format": "mp4",
+    "platforms": {
+        "youtube": {
+            "enabled": True,
+            "quality_preference": [
+                "1080",
+                "720",
+                "best"
+            ]
+        },
+        "pornhub": {
+            "enabled": True,
+            "quality_preference": [
+                "720",
+                "best"
+            ],
+            "age_verification": True
+        },
+        "twitter": {
+            "enabled": True,
+            "quality_preference": [
+                "720",
+                "best"
+            ]
+        },
+        "instagram": {
+            "enabled": True,
+            "quality_preference": [
+                "720",
+                "best"
+            ]
+        },
+        "tiktok": {
+            "enabled": True,
+            "quality_preference": [
+                "720",
+                "best"
+            ]
+        },
+        "bilibili": {
+            "enabled": True,
+            "quality_preference": [
+                "1080",
+                "720",
+                "best"
+            ]
+        },
+        "twitch": {
+            "enabled": True,
+            "quality_preference": [
+                "720",
+                "best"
+            ]
+        },
+        "generic": {
+            "enabled": True
+        }
+    },
+    "download_settings": {
+        "retry_attempts": 3,
+        "timeout": 300,
+        "concurrent_downloads": 2
+    },
+    "file_settings": {
+        "filename_template": "%(title)s.%(ext)s",
+        "subtitle_languages": ["zh", "en"],
+        "embed_subtitles": False
+    },
+    "network_settings": {
+        "proxy": "",
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    }
+}
+DEFAULT_CONFIG = MappingProxyType(_DEFAULT_CONFIG_DATA)
+
+# 不依赖文件系统的配置值校验
+_CONFIG_VALUE_VALIDATORS = {
+    "max_workers": lambda v: isinstance(v, int) and v > 0,
+    "default_quality": lambda v: isinstance(v, str) and len(v) > 0,
+    "default_format": lambda v: isinstance(v, str) and len(v) > 0,
+    "platforms": lambda v: isinstance(v, dict),
+}
 
 
 class ConfigManager:
@@ -18,9 +123,24 @@ class ConfigManager:
     def __init__(self, silent: bool = False):
         self.silent = silent
         self.errors: List[ErrorInfo] = []
+        self._seen_errors = set()
         self.path_manager = PathManager(silent=silent)
         self.project_root = self.path_manager.get_project_root()
+        # 已加载配置缓存: 文件路径 -> ((mtime_ns, size), config)
+        self._config_cache: Dict[str, tuple] = {}
+        # 配置值校验表: 字段名 -> 校验函数（覆盖全部必需字段）
+        self._value_validators = {
+            **_CONFIG_VALUE_VALIDATORS,
+            "default_output_dir": self._is_valid_output_dir,
+        }
         
+    def invalidate_cache(self, config_path: Optional[str] = None):
+        """清除配置缓存（不指定路径时清除全部）"""
+        if config_path is None:
+            self._config_cache.clear()
+        else:
+            self._config_cache.pop(str(self.project_root / config_path), None)
+    
     def load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """加载配置文件"""
         if config_path is None:
@@ -32,23 +152,34 @@ class ConfigManager:
             print_progress(f"加载配置: {config_file}")
         
         try:
-            if not config_file.exists():
+            try:
+                stat = config_file.stat()
+            except FileNotFoundError:
                 if not self.silent:
                     print_progress("配置文件不存在，创建默认配置")
-                return self.create_default_config()
+                return self.create_and_save_default_config()
             
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            # 文件未变化时直接返回缓存的副本
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._config_cache.get(str(config_file))
+            if cached is not None and cached[0] == stat_key:
+                return copy.deepcopy(cached[1])
+            
+            config = loads_json(config_file.read_bytes())
             
             # 标准化路径
             config = self.normalize_paths(config)
             
             # 验证配置
             if not self.validate_config(config):
+                # 只用默认值替换无效或缺失的字段，保留其余用户设置
                 if not self.silent:
-                    print_progress("配置验证失败，使用默认配置")
-                return self.create_default_config()
+                    print_progress("配置验证失败，修复无效字段")
+                config = self.repair_config(config)
+                self.save_config(config, config_path)
+                return config
             
+            self._config_cache[str(config_file)] = (stat_key, copy.deepcopy(config))
             return config
             
         except json.JSONDecodeError as e:
@@ -59,8 +190,8 @@ class ConfigManager:
                 severity="warning",
                 auto_fixable=True
             )
-            self.errors.append(error)
-            return self.create_default_config()
+            self._add_error(error)
+            return self.create_and_save_default_config()
             
         except Exception as e:
             error = ErrorInfo(
@@ -69,8 +200,8 @@ class ConfigManager:
                 solution="将使用默认配置",
                 severity="error"
             )
-            self.errors.append(error)
-            return self.create_default_config()
+            self._add_error(error)
+            return self.create_and_save_default_config()
     
     def save_config(self, config: Dict[str, Any], config_path: Optional[str] = None) -> bool:
         """保存配置文件"""
@@ -83,16 +214,13 @@ class ConfigManager:
             print_progress(f"保存配置: {config_file}")
         
         try:
-            # 备份现有配置
-            if config_file.exists():
-                self.path_manager.backup_config(config_file)
+            self._config_cache.pop(str(config_file), None)
             
             # 标准化路径
             normalized_config = self.normalize_paths(config)
             
-            # 保存配置
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(normalized_config, f, indent=2, ensure_ascii=False)
+            # 原子写入：先完整写入同目录临时文件，再替换（中途崩溃不会截断原配置）
+            atomic_write_bytes(config_file, dumps_json(normalized_config))
             
             return True
             
@@ -103,95 +231,23 @@ class ConfigManager:
                 solution="请检查文件权限",
                 severity="error"
             )
-            self.errors.append(error)
+            self._add_error(error)
             return False
     
     def normalize_paths(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """标准化配置中的路径"""
         return self.path_manager.normalize_config_paths(config)
     
-    def create_default_config(self) -> Dict[str, Any]:
-        """创建默认配置"""
+    def _default_config_template(self) -> Dict[str, Any]:
+        """获取默认配置的独立副本（不写入磁盘）"""
+        return copy.deepcopy(_DEFAULT_CONFIG_DATA)
+    
+    def create_and_save_default_config(self) -> Dict[str, Any]:
+        """创建默认配置并保存到磁盘"""
         if not self.silent:
             print_progress("创建默认配置")
         
-        default_config = {
-            "max_workers": 4,
-            "default_output_dir": "./downloads",
-            "default_quality": "best",
-            "default_format": "mp4",
-            "platforms": {
-                "youtube": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "1080",
-                        "720",
-                        "best"
-                    ]
-                },
-                "pornhub": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "720",
-                        "best"
-                    ],
-                    "age_verification": True
-                },
-                "twitter": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "720",
-                        "best"
-                    ]
-                },
-                "instagram": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "720",
-                        "best"
-                    ]
-                },
-                "tiktok": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "720",
-                        "best"
-                    ]
-                },
-                "bilibili": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "1080",
-                        "720",
-                        "best"
-                    ]
-                },
-                "twitch": {
-                    "enabled": True,
-                    "quality_preference": [
-                        "720",
-                        "best"
-                    ]
-                },
-                "generic": {
-                    "enabled": True
-                }
-            },
-            "download_settings": {
-                "retry_attempts": 3,
-                "timeout": 300,
-                "concurrent_downloads": 2
-            },
-            "file_settings": {
-                "filename_template": "%(title)s.%(ext)s",
-                "subtitle_languages": ["zh", "en"],
-                "embed_subtitles": False
-            },
-            "network_settings": {
-                "proxy": "",
-                "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        }
+        default_config = self._default_config_template()
         
         # 保存默认配置
         self.save_config(default_config)
@@ -202,41 +258,21 @@ class ConfigManager:
         """验证配置文件的有效性"""
         try:
             # 检查必需的字段
-            required_fields = [
-                "max_workers",
-                "default_output_dir",
-                "default_quality",
-                "default_format",
-                "platforms"
-            ]
-            
-            for field in required_fields:
-                if field not in config:
-                    error = ErrorInfo(
-                        code="config_missing_field",
-                        message=f"配置缺少必需字段: {field}",
-                        solution="将使用默认值",
-                        severity="warning",
-                        auto_fixable=True
-                    )
-                    self.errors.append(error)
-                    return False
-            
-            # 验证数值字段
-            if not isinstance(config.get("max_workers"), int) or config["max_workers"] < 1:
+            if not _REQUIRED_FIELD_SET.issubset(config.keys()):
+                field = next(f for f in REQUIRED_CONFIG_FIELDS if f not in config)
+                error = ErrorInfo(
+                    code="config_missing_field",
+                    message=_ERR_MISSING_FIELD_FMT.format(field),
+                    solution="将使用默认值",
+                    severity="warning",
+                    auto_fixable=True
+                )
+                self._add_error(error)
                 return False
             
-            # 验证路径字段
-            output_dir = config.get("default_output_dir")
-            if output_dir and not self.path_manager.validate_path(output_dir):
-                return False
-            
-            # 验证平台配置
-            platforms = config.get("platforms", {})
-            if not isinstance(platforms, dict):
-                return False
-            
-            return True
+            # 按校验表逐个检查必需字段的类型和取值
+            validators = self._value_validators
+            return all(validators[field](config[field]) for field in REQUIRED_CONFIG_FIELDS)
             
         except Exception:
             return False
@@ -255,9 +291,14 @@ class ConfigManager:
             print_progress("迁移配置文件...")
         
         try:
-            # 加载旧配置
-            with open(old_config_file, 'r', encoding='utf-8') as f:
-                old_config = json.load(f)
+            raw = old_config_file.read_bytes()
+            
+            # 加载旧配置（格式错误时按迁移失败处理）
+            old_config = loads_json(raw)
+            
+            # 快速路径：旧配置就是目标配置文件，且没有绝对路径形式的字符串值时无需迁移和重写
+            if old_config_path == "downloader_config.json" and _ABS_PATH_VALUE_RE.search(raw) is None:
+                return True
             
             # 迁移路径
             migrated_config = self.path_manager.migrate_absolute_paths(old_config)
@@ -272,7 +313,7 @@ class ConfigManager:
                 solution="将创建新的默认配置",
                 severity="warning"
             )
-            self.errors.append(error)
+            self._add_error(error)
             return False
     
     def repair_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -280,55 +321,56 @@ class ConfigManager:
         if not self.silent:
             print_progress("修复配置文件...")
         
-        # 获取默认配置作为模板
-        default_config = self.create_default_config()
+        # 获取默认配置作为模板（仅内存副本，不写入磁盘）
+        default_config = self._default_config_template()
         
         # 合并配置（保留有效的用户设置）
-        repaired_config = default_config.copy()
-        
-        def merge_dict(target: Dict, source: Dict):
-            """递归合并字典"""
-            for key, value in source.items():
-                if key in target:
-                    if isinstance(target[key], dict) and isinstance(value, dict):
-                        merge_dict(target[key], value)
-                    else:
-                        # 验证值的有效性
-                        if self._is_valid_config_value(key, value):
-                            target[key] = value
+        repaired_config = copy.deepcopy(default_config)
         
         try:
-            merge_dict(repaired_config, config)
+            self._merge_valid_values(repaired_config, config)
         except Exception:
             # 如果合并失败，使用默认配置
             repaired_config = default_config
         
         return repaired_config
     
+    def _merge_valid_values(self, target: Dict, source: Dict):
+        """将source中有效的值合并到target（显式栈迭代，只合并target已有的键）"""
+        stack = [(target, source)]
+        while stack:
+            target_dict, source_dict = stack.pop()
+            for key, value in source_dict.items():
+                if key not in target_dict:
+                    continue
+                current = target_dict[key]
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                elif self._is_valid_config_value(key, value):
+                    target_dict[key] = value
+    
     def _is_valid_config_value(self, key: str, value: Any) -> bool:
         """验证配置值的有效性"""
+        validator = self._value_validators.get(key)
+        if validator is None:
+            return True  # 其他字段暂时不验证
         try:
-            if key == "max_workers":
-                return isinstance(value, int) and value > 0
-            elif key in ["default_output_dir"]:
-                return isinstance(value, str) and self.path_manager.validate_path(value)
-            elif key in ["default_quality", "default_format"]:
-                return isinstance(value, str) and len(value) > 0
-            elif key == "platforms":
-                return isinstance(value, dict)
-            else:
-                return True  # 其他字段暂时不验证
+            return validator(value)
         except Exception:
             return False
     
+    def _is_valid_output_dir(self, value: Any) -> bool:
+        """验证输出目录"""
+        return isinstance(value, str) and self.path_manager.validate_path(value)
+    
     def get_config_info(self) -> Dict[str, Any]:
         """获取配置信息摘要"""
         config = self.load_config()
         
         info = {
             "config_file": str(self.project_root / "downloader_config.json"),
-            "platforms_enabled": len([p for p, settings in config.get("platforms", {}).items() 
-                                    if settings.get("enabled", False)]),
+            "platforms_enabled": sum(1 for settings in config.get("platforms", {}).values()
+                                     if settings.get("enabled", False)),
             "output_directory": config.get("default_output_dir", "./downloads"),
             "max_workers": config.get("max_workers", 4),
             "default_quality": config.get("default_quality", "best")
@@ -347,9 +389,8 @@ class ConfigManager:
             if config_file.exists():
                 self.path_manager.backup_config(config_file)
             
-            # 创建默认配置
-            self.create_default_config()
-            return True
+            # 写入默认配置（单次保存，返回真实的保存结果）
+            return self.save_config(self._default_config_template())
             
         except Exception as e:
             error = ErrorInfo(
@@ -358,13 +399,31 @@ class ConfigManager:
                 solution="请手动删除配置文件",
                 severity="error"
             )
-            self.errors.append(error)
+            self._add_error(error)
             return False
     
+    def _add_error(self, error: ErrorInfo):
+        """记录错误（相同错误只记录一次）"""
+        if error not in self._seen_errors:
+            self._seen_errors.add(error)
+            self.errors.append(error)
+    
     def get_errors(self) -> List[ErrorInfo]:
         """获取错误列表"""
         return self.errors + self.path_manager.get_errors()
     
     def has_errors(self) -> bool:
         """是否有错误"""
-        return len(self.get_errors()) > 0
\ No newline at end of file
+        return len(self.get_errors()) > 0
+
+
+# 共享实例（按silent区分），避免各模块重复创建PathManager和配置缓存
+_instances: Dict[bool, ConfigManager] = {}
+
+
+def get_config_manager(silent: bool = False) -> ConfigManager:
+    """获取共享的配置管理器（推荐入口，首次调用时创建）"""
+    instance = _instances.get(silent)
+    if instance is None:
+        instance = _instances[silent] = ConfigManager(silent=silent)
+    return instance
@@ -3,8 +3,12 @@
 Apple式设计：静默安装，智能选择，优雅降级
 """
 
+import importlib.metadata
+import re
 import subprocess
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
@@ -13,6 +17,66 @@ from .models import PackageManager, ErrorInfo
 from .utils import is_command_available, get_friendly_error_message, print_progress
 
 
+# pip调用前缀：跳过PyPI自更新检查和交互提示
+PIP_COMMAND = [sys.executable, "-m", "pip", "--disable-pip-version-check", "--no-input"]
+
+# 生成的pyproject.toml内容
+PYPROJECT_CONTENT = '''[project]
+name = "universal-video-downloader"
+version = "1.0.0"
+description = "Universal multi-platform video downloader with portable deployment"
+requires-python = ">=3.8"
+dependencies = [
+    "yt-dlp>=2024.11.04",
+]
+
+[project.optional-dependencies]
+gui = [
+    "PyQt6>=6.0.0; platform_system!='Darwin'",
+    "PySide6>=6.0.0; platform_system=='Darwin'"
+]
+dev = [
+    "pytest>=7.0.0",
+    "black>=22.0.0"
+]
+
+[build-system]
+requires = ["setuptools>=45", "wheel"]
+build-backend = "setuptools.build_meta"
+
+[tool.uv]
+dev-dependencies = [
+    "pytest>=7.0.0",
+    "black>=22.0.0"
+]
+
+[tool.uv.sources]
+# 可以在这里指定特定的包源
+'''
+
+
+def _normalize_dist_name(name: str) -> str:
+    """按PEP 503规范化包名（yt-dlp / yt_dlp / YT.DLP 视为相同）"""
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+@lru_cache(maxsize=1)
+def _installed_distributions() -> frozenset:
+    """一次性读取已安装包的元数据（不导入任何模块），安装后需调用 cache_clear"""
+    names = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            names.add(_normalize_dist_name(name))
+    return frozenset(names)
+
+
+def is_package_installed(package: str) -> bool:
+    """检查包是否已安装，package可带版本约束，如 "yt-dlp>=2024.11.04" """
+    name = re.split(r"[<>=!~;\[\s]", package, maxsplit=1)[0]
+    return _normalize_dist_name(name) in _installed_distributions()
+
+
 class PackageManagerInterface(ABC):
     """包管理器接口"""
     
@@ -40,6 +104,46 @@ class PackageManagerInterface(ABC):
     def get_version(self, package: str) -> Optional[str]:
         """获取包版本"""
         pass
+    
+    # pip list 结果缓存时间（秒），会话内已安装的包很少变化
+    PACKAGE_LIST_TTL = 30.0
+    
+    _pkg_list_cache: Optional[Tuple[float, List[str], Dict[str, str]]] = None
+    
+    def _list_packages(self, cmd: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """运行一次 list --format=freeze，返回包名列表和 规范化包名->版本 映射（带TTL缓存）"""
+        cache = self._pkg_list_cache
+        if cache is not None and time.monotonic() - cache[0] < self.PACKAGE_LIST_TTL:
+            return cache[1], cache[2]
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=30
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return [], {}
+        
+        packages = []
+        versions = {}
+        for line in result.stdout.strip().split('\n'):
+            if '==' in line:
+                name, version = line.split('==', 1)
+                packages.append(name)
+                versions[_normalize_dist_name(name)] = version.strip()
+        self._pkg_list_cache = (time.monotonic(), packages, versions)
+        return packages, versions
+    
+    def _invalidate_package_cache(self):
+        """安装后清除已安装包缓存（包括环境检查结果缓存）"""
+        self._pkg_list_cache = None
+        _installed_distributions.cache_clear()
+        
+        from .env_checker import EnvChecker
+        EnvChecker.clear_result_cache()
 
 
 class UvManager(PackageManagerInterface):
@@ -47,6 +151,7 @@ class UvManager(PackageManagerInterface):
     
     def __init__(self):
         self.command = "uv"
+        self._venv_ready = False
     
     def is_available(self) -> bool:
         """检查uv是否可用"""
@@ -59,7 +164,7 @@ class UvManager(PackageManagerInterface):
             self._ensure_venv()
             
             # 安装包
-            cmd = [self.command, "add"] + packages
+            cmd = [self.command, "add", "--no-progress"] + packages
             result = subprocess.run(
                 cmd, 
                 capture_output=True, 
@@ -67,59 +172,36 @@ class UvManager(PackageManagerInterface):
                 check=True,
                 timeout=300
             )
+            self._invalidate_package_cache()
             return result.returncode == 0
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
     def check_installed(self, package: str) -> bool:
         """检查包是否已安装"""
-        try:
-            # 尝试导入包
-            package_import_name = package.replace("-", "_")
-            __import__(package_import_name)
-            return True
-        except ImportError:
-            return False
+        return is_package_installed(package)
     
     def list_installed(self) -> List[str]:
         """列出已安装的包"""
-        try:
-            result = subprocess.run(
-                [self.command, "pip", "list", "--format=freeze"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-            
-            packages = []
-            for line in result.stdout.strip().split('\n'):
-                if '==' in line:
-                    packages.append(line.split('==')[0])
-            return packages
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            return []
+        packages, _ = self._list_packages([self.command, "pip", "list", "--format=freeze"])
+        return list(packages)
     
     def get_version(self, package: str) -> Optional[str]:
-        """获取包版本"""
+        """获取包版本（优先读取包元数据，失败时回退到 list 结果）"""
         try:
-            result = subprocess.run(
-                [self.command, "pip", "show", package],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-            
-            for line in result.stdout.split('\n'):
-                if line.startswith('Version:'):
-                    return line.split(':', 1)[1].strip()
-            return None
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
             return None
+        except Exception:
+            _, versions = self._list_packages([self.command, "pip", "list", "--format=freeze"])
+            return versions.get(_normalize_dist_name(package))
     
     def _ensure_venv(self):
-        """确保虚拟环境存在"""
+        """确保虚拟环境存在（每个实例只执行一次）"""
+        if self._venv_ready:
+            return
+        self._venv_ready = True
+        
         try:
             # 检查是否已经在虚拟环境中
             if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
@@ -164,7 +246,7 @@ class PipManager(PackageManagerInterface):
     def install(self, packages: List[str]) -> bool:
         """使用pip安装包"""
         try:
-            cmd = [sys.executable, "-m", "pip", "install"] + packages
+            cmd = PIP_COMMAND + ["install"] + packages
             result = subprocess.run(
                 cmd,
                 capture_output=True,
@@ -172,55 +254,29 @@ class PipManager(PackageManagerInterface):
                 check=True,
                 timeout=300
             )
+            self._invalidate_package_cache()
             return result.returncode == 0
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             return False
     
     def check_installed(self, package: str) -> bool:
         """检查包是否已安装"""
-        try:
-            package_import_name = package.replace("-", "_")
-            __import__(package_import_name)
-            return True
-        except ImportError:
-            return False
+        return is_package_installed(package)
     
     def list_installed(self) -> List[str]:
         """列出已安装的包"""
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "list", "--format=freeze"],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-            
-            packages = []
-            for line in result.stdout.strip().split('\n'):
-                if '==' in line:
-                    packages.append(line.split('==')[0])
-            return packages
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-            return []
+        packages, _ = self._list_packages(PIP_COMMAND + ["list", "--format=freeze"])
+        return list(packages)
     
     def get_version(self, package: str) -> Optional[str]:
-        """获取包版本"""
+        """获取包版本（优先读取包元数据，失败时回退到 list 结果）"""
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "show", package],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-            
-            for line in result.stdout.split('\n'):
-                if line.startswith('Version:'):
-                    return line.split(':', 1)[1].strip()
-            return None
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+            return importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
             return None
+        except Exception:
+            _, versions = self._list_packages(PIP_COMMAND + ["list", "--format=freeze"])
+            return versions.get(_normalize_dist_name(package))
 
 
 class DependencyManager:
@@ -229,7 +285,15 @@ class DependencyManager:
     def __init__(self, silent: bool = False):
         self.silent = silent
         self.errors: List[ErrorInfo] = []
-        self.package_manager = self._detect_package_manager()
+        self._seen_errors = set()
+        self._package_manager: Optional[PackageManagerInterface] = None
+    
+    @property
+    def package_manager(self) -> PackageManagerInterface:
+        """当前使用的包管理器（首次使用时检测）"""
+        if self._package_manager is None:
+            self._package_manager = self._detect_package_manager()
+        return self._package_manager
         
     def _detect_package_manager(self) -> PackageManagerInterface:
         """检测并选择最佳的包管理器"""
@@ -254,7 +318,7 @@ class DependencyManager:
             solution="请安装pip或uv",
             severity="error"
         )
-        self.errors.append(error)
+        self._add_error(error)
         return pip_manager  # 返回pip作为默认值
     
     def get_package_manager_type(self) -> PackageManager:
@@ -274,21 +338,29 @@ class DependencyManager:
         if not self.silent:
             print_progress(f"正在安装依赖包: {', '.join(packages)}")
         
+        missing = [package for package in packages if not self.check_installed(package)]
+        if not missing:
+            return True
+        
+        # 一次调用安装全部缺失的包，让pip/uv统一解析依赖
+        if not self.silent:
+            print_progress(f"安装 {', '.join(missing)}...")
+        if self.package_manager.install(missing):
+            return True
+        
+        # 批量安装失败时逐个重试，以便准确报告失败的包
         success = True
-        for package in packages:
-            if not self.check_installed(package):
-                if not self.silent:
-                    print_progress(f"安装 {package}...")
-                
-                if not self.package_manager.install([package]):
-                    error = ErrorInfo(
-                        code="install_failed",
-                        message=f"安装 {package} 失败",
-                        solution="请检查网络连接或手动安装",
-                        severity="error"
-                    )
-                    self.errors.append(error)
-                    success = False
+        for package in missing:
+            if len(missing) > 1 and self.package_manager.install([package]):
+                continue
+            error = ErrorInfo(
+                code="install_failed",
+                message=f"安装 {package} 失败",
+                solution="请检查网络连接或手动安装",
+                severity="error"
+            )
+            self._add_error(error)
+            success = False
         
         return success
     
@@ -329,10 +401,16 @@ class DependencyManager:
             project_root = Path(__file__).parent.parent
             pyproject_file = project_root / "pyproject.toml"
             
-            content = self._get_pyproject_content()
+            content = self._get_pyproject_content().encode('utf-8')
             
-            with open(pyproject_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 内容未变化时不重写，避免更新mtime导致uv/IDE重新解析
+            try:
+                if pyproject_file.read_bytes() == content:
+                    return True
+            except FileNotFoundError:
+                pass
+            
+            pyproject_file.write_bytes(content)
             
             if not self.silent:
                 print_progress("已生成 pyproject.toml")
@@ -345,43 +423,12 @@ class DependencyManager:
                 solution="请检查文件权限",
                 severity="error"
             )
-            self.errors.append(error)
+            self._add_error(error)
             return False
     
     def _get_pyproject_content(self) -> str:
         """获取pyproject.toml内容"""
-        return '''[project]
-name = "universal-video-downloader"
-version = "1.0.0"
-description = "Universal multi-platform video downloader with portable deployment"
-requires-python = ">=3.8"
-dependencies = [
-    "yt-dlp>=2024.11.04",
-]
-
-[project.optional-dependencies]
-gui = [
-    "PyQt6>=6.0.0; platform_system!='Darwin'",
-    "PySide6>=6.0.0; platform_system=='Darwin'"
-]
-dev = [
-    "pytest>=7.0.0",
-    "black>=22.0.0"
-]
-
-[build-system]
-requires = ["setuptools>=45", "wheel"]
-build-backend = "setuptools.build_meta"
-
-[tool.uv]
-dev-dependencies = [
-    "pytest>=7.0.0",
-    "black>=22.0.0"
-]
-
-[tool.uv.sources]
-# 可以在这里指定特定的包源
-'''
+        return PYPROJECT_CONTENT
     
     def migrate_from_requirements_txt(self) -> bool:
         """从requirements.txt迁移到pyproject.toml"""
@@ -413,9 +460,15 @@ dev-dependencies = [
                 solution="请手动创建pyproject.toml",
                 severity="warning"
             )
-            self.errors.append(error)
+            self._add_error(error)
             return False
     
+    def _add_error(self, error: ErrorInfo):
+        """记录错误（相同错误只记录一次）"""
+        if error not in self._seen_errors:
+            self._seen_errors.add(error)
+            self.errors.append(error)
+    
     def get_errors(self) -> List[ErrorInfo]:
         """获取错误列表"""
         return self.errors
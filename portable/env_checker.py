@@ -3,8 +3,14 @@
 Apple式用户体验：静默检查，智能修复，优雅提示
 """
 
+import importlib.util
+import os
 import sys
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from .models import EnvironmentInfo, SystemPlatform, PackageManager, ErrorInfo, ProjectStructure
@@ -13,6 +19,7 @@ from .utils import (
     get_python_version, 
     is_python_version_compatible,
     find_project_root,
+    check_first_run,
     ensure_directory,
     is_command_available,
     get_friendly_error_message,
@@ -20,62 +27,171 @@ from .utils import (
     print_success_message,
     print_progress
 )
-from .error_handler import global_error_handler
+
+
+# 环境检查报告的固定头部
+_SUMMARY_HEADER_TEMPLATE = "\n".join([
+    "\n" + "=" * 50,
+    "🔍 环境检查报告",
+    "=" * 50,
+    "Python版本: {python_version}",
+    "系统平台: {platform}",
+    "项目根目录: {project_root}",
+    "包管理器: {package_manager}",
+])
+
+
+def _safe_mtime_ns(path: Path) -> Optional[int]:
+    """获取文件修改时间，不存在时返回None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _copy_env_info(env_info: EnvironmentInfo) -> EnvironmentInfo:
+    """复制环境信息（含可变的状态字典），避免调用方修改缓存中的结果"""
+    return replace(
+        env_info,
+        dependencies_status=dict(env_info.dependencies_status),
+        directories_status=dict(env_info.directories_status)
+    )
 
 
 class EnvChecker:
     """环境检测器 - Apple式设计：开箱即用，静默智能"""
     
-    def __init__(self, silent: bool = False):
+    # 检查结果缓存: 缓存键 -> (环境信息, 错误, 警告)，进程内各实例共享
+    RESULT_CACHE_SIZE = 8
+    _result_cache: Dict[tuple, Tuple[EnvironmentInfo, Tuple[ErrorInfo, ...], Tuple[ErrorInfo, ...]]] = {}
+    
+    def __init__(self, silent: bool = False, strict: bool = False):
         self.silent = silent
+        self.strict = strict  # 严格模式：实际导入依赖包，而不只是查找模块
         self.errors: List[ErrorInfo] = []
         self.warnings: List[ErrorInfo] = []
         self.project_root = find_project_root()
+        # 各项检查并行执行时保护 errors/warnings 和终端输出
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 记录时即收集可自动修复的问题
+        self._auto_fixable: List[ErrorInfo] = []
         
     def check_all(self) -> EnvironmentInfo:
         """执行完整的环境检查"""
         if not self.silent:
             print_welcome_message()
             
-        # 检查Python版本
-        python_version = get_python_version()
-        python_ok = self._check_python_version()
+        # 缓存键与各项检查使用同一次扫描的结果，缓存中只保存本次扫描得到的检查结果
+        root_mtimes = self._root_mtimes()
+        root_entries = self._scan_project_root()
+        cache_key = (str(self.project_root), self.strict, root_mtimes, root_entries)
         
-        # 检查系统平台
-        platform = detect_system_platform()
+        # 文件系统未变化时复用上一次的检查结果
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            env_info, errors, warnings = cached
+            env_info = _copy_env_info(env_info)
+            for issue in errors:
+                self._add_issue(self.errors, issue)
+            for issue in warnings:
+                self._add_issue(self.warnings, issue)
+        else:
+            errors_start, warnings_start = len(self.errors), len(self.warnings)
+            env_info = self._run_checks(root_entries)
+            
+            if len(self._result_cache) >= self.RESULT_CACHE_SIZE:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[cache_key] = (
+                _copy_env_info(env_info),
+                tuple(self.errors[errors_start:]),
+                tuple(self.warnings[warnings_start:])
+            )
         
-        # 检查包管理器
-        package_manager = self._check_package_managers()
+        if not self.silent:
+            self._print_summary(env_info)
+            
+        return env_info
+    
+    def _run_checks(self, root_entries: frozenset) -> EnvironmentInfo:
+        """执行各项检查并汇总为环境信息（root_entries为本次检查的项目根目录快照）"""
+        # 只输出一条进度信息（各项检查并行执行，逐项输出顺序不确定）
+        self._progress("检查环境: Python版本、包管理器、依赖包、配置文件、目录结构...")
         
-        # 检查依赖
-        dependencies_status = self._check_dependencies()
+        # 各项检查相互独立且以I/O为主，并行执行
+        probes = (
+            self._check_python_version,
+            self._check_package_managers,
+            self._check_dependencies,
+            partial(self._check_config, root_entries),
+            partial(self._check_directories, root_entries),
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self._run_probe, probe) for probe in probes]
+            
+            # 检查系统平台
+            python_version = get_python_version()
+            system_platform = detect_system_platform()
+            
+            outcomes = [future.result() for future in futures]
         
-        # 检查配置
-        config_status = self._check_config()
+        # 按固定的检查顺序记录问题，报告顺序不受完成先后影响
+        for _, issues in outcomes:
+            for target, issue in issues:
+                self._add_issue(target, issue)
         
-        # 检查目录结构
-        directories_status = self._check_directories()
+        results = [result for result, _ in outcomes]
+        _, package_manager, dependencies_status, config_status, directories_status = results
         
-        env_info = EnvironmentInfo(
+        return EnvironmentInfo(
             python_version=python_version,
-            platform=platform,
+            platform=system_platform,
             project_root=self.project_root,
             package_manager=package_manager,
             dependencies_status=dependencies_status,
             config_status=config_status,
             directories_status=directories_status
         )
-        
+    
+    def _root_mtimes(self) -> tuple:
+        """项目根目录及配置文件的修改时间（在扫描前读取，扫描期间的变化会使缓存键失效）"""
+        return (
+            _safe_mtime_ns(self.project_root),
+            _safe_mtime_ns(self.project_root / "downloader_config.json")
+        )
+    
+    @classmethod
+    def clear_result_cache(cls):
+        """清除检查结果缓存（安装依赖等无法从文件时间判断的变化后调用）"""
+        cls._result_cache.clear()
+    
+    def _progress(self, message: str):
+        """输出进度信息（加锁避免并行检查时输出交错）"""
         if not self.silent:
-            self._print_summary(env_info)
-            
-        return env_info
+            with self._lock:
+                print_progress(message)
+    
+    def _run_probe(self, probe):
+        """执行一项检查，返回 (检查结果, 该检查发现的问题列表)"""
+        self._local.pending = pending = []
+        try:
+            return probe(), pending
+        finally:
+            self._local.pending = None
+    
+    def _add_issue(self, issues: List[ErrorInfo], issue: ErrorInfo):
+        """记录错误或警告（线程安全；并行检查中先暂存，由_run_checks按顺序合并）"""
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((issues, issue))
+            return
+        with self._lock:
+            issues.append(issue)
+            if issue.auto_fixable:
+                self._auto_fixable.append(issue)
     
     def _check_python_version(self) -> bool:
         """检查Python版本"""
-        if not self.silent:
-            print_progress("检查Python版本...")
-            
         if not is_python_version_compatible("3.8"):
             error = ErrorInfo(
                 code="python_version",
@@ -83,16 +199,13 @@ class EnvChecker:
                 solution="请升级到Python 3.8或更高版本",
                 severity="error"
             )
-            self.errors.append(error)
+            self._add_issue(self.errors, error)
             return False
         
         return True
     
     def _check_package_managers(self) -> PackageManager:
         """检查包管理器可用性"""
-        if not self.silent:
-            print_progress("检查包管理器...")
-            
         # 优先检查uv
         if is_command_available("uv"):
             return PackageManager.UV
@@ -106,7 +219,7 @@ class EnvChecker:
                 severity="warning",
                 auto_fixable=True
             )
-            self.warnings.append(warning)
+            self._add_issue(self.warnings, warning)
             return PackageManager.PIP
         
         # 都不可用
@@ -116,14 +229,11 @@ class EnvChecker:
             solution="请重新安装Python或修复pip",
             severity="error"
         )
-        self.errors.append(error)
+        self._add_issue(self.errors, error)
         return PackageManager.NONE
     
     def _check_dependencies(self) -> Dict[str, bool]:
         """检查依赖包状态"""
-        if not self.silent:
-            print_progress("检查依赖包...")
-            
         required_packages = ["yt-dlp"]
         optional_packages = ["PyQt6", "PySide6"]
         
@@ -131,22 +241,15 @@ class EnvChecker:
         
         # 检查必需依赖
         for package in required_packages:
-            try:
-                __import__(package.replace("-", "_"))
-                status[package] = True
-            except ImportError:
-                status[package] = False
+            status[package] = self._is_module_available(package.replace("-", "_"))
                 
         # 检查可选依赖（GUI）
         gui_available = False
         for package in optional_packages:
-            try:
-                __import__(package)
-                status[package] = True
+            status[package] = self._is_module_available(package)
+            if status[package]:
                 gui_available = True
                 break
-            except ImportError:
-                status[package] = False
                 
         if not gui_available:
             warning = ErrorInfo(
@@ -156,18 +259,39 @@ class EnvChecker:
                 severity="warning",
                 auto_fixable=True
             )
-            self.warnings.append(warning)
+            self._add_issue(self.warnings, warning)
             
         return status
     
-    def _check_config(self) -> bool:
-        """检查配置文件"""
-        if not self.silent:
-            print_progress("检查配置文件...")
-            
-        config_file = self.project_root / "downloader_config.json"
+    def _is_module_available(self, module_name: str) -> bool:
+        """检查模块是否可导入
         
-        if not config_file.exists():
+        默认只用find_spec查找模块而不执行它（避免加载yt-dlp/Qt的开销），
+        但模块能找到并不保证导入一定成功；strict模式下实际导入以确认。
+        """
+        if self.strict:
+            try:
+                __import__(module_name)
+                return True
+            except ImportError:
+                return False
+        
+        try:
+            return importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    def _scan_project_root(self) -> frozenset:
+        """读取项目根目录的条目名称（单次scandir代替逐个stat）"""
+        try:
+            with os.scandir(self.project_root) as it:
+                return frozenset(entry.name for entry in it)
+        except OSError:
+            return frozenset()
+    
+    def _check_config(self, root_entries: frozenset) -> bool:
+        """检查配置文件"""
+        if "downloader_config.json" not in root_entries:
             warning = ErrorInfo(
                 code="config_missing",
                 message=get_friendly_error_message("config_missing"),
@@ -175,91 +299,85 @@ class EnvChecker:
                 severity="warning",
                 auto_fixable=True
             )
-            self.warnings.append(warning)
+            self._add_issue(self.warnings, warning)
             return False
             
         return True
     
-    def _check_directories(self) -> Dict[str, bool]:
+    def _check_directories(self, root_entries: frozenset) -> Dict[str, bool]:
         """检查目录结构"""
-        if not self.silent:
-            print_progress("检查目录结构...")
-            
-        status = {}
+        status = {dir_name: dir_name in root_entries for dir_name in ProjectStructure.REQUIRED_DIRS}
         
-        for dir_name in ProjectStructure.REQUIRED_DIRS:
-            dir_path = self.project_root / dir_name
-            status[dir_name] = dir_path.exists()
-            
-            if not status[dir_name]:
-                warning = ErrorInfo(
-                    code="dir_missing",
-                    message=f"目录 {dir_name} 不存在",
-                    solution="将自动创建必要目录",
-                    severity="warning",
-                    auto_fixable=True
-                )
-                self.warnings.append(warning)
+        # 所有缺失目录合并为一条警告（一次修复会创建全部必要目录）
+        missing = [dir_name for dir_name, exists in status.items() if not exists]
+        if missing:
+            warning = ErrorInfo(
+                code="dir_missing",
+                message=f"目录缺失: {', '.join(missing)}",
+                solution="将自动创建必要目录",
+                severity="warning",
+                auto_fixable=True
+            )
+            self._add_issue(self.warnings, warning)
                 
         return status
     
     def auto_fix_issues(self) -> bool:
         """自动修复可修复的问题（静默自愈）"""
-        if not self.silent:
-            print_progress("正在自动修复问题...")
+        self._progress("正在自动修复问题...")
         
         # 使用全局错误处理器进行静默自愈
-        all_issues = self.errors + self.warnings
-        auto_fixable_issues = [issue for issue in all_issues if issue.auto_fixable]
+        auto_fixable_issues = self._auto_fixable
         
         if auto_fixable_issues:
             if not self.silent:
                 print_progress(f"发现 {len(auto_fixable_issues)} 个可自动修复的问题")
             
-            # 静默修复
+            # 静默修复（仅在需要修复时才加载错误处理器及其依赖）
+            from .error_handler import global_error_handler
             fix_results = global_error_handler.auto_fix_errors(auto_fixable_issues)
-            success_count = sum(1 for success in fix_results.values() if success)
+            self.clear_result_cache()
             
             if not self.silent:
-                print_progress(f"成功修复 {success_count}/{len(auto_fixable_issues)} 个问题")
+                success_count = sum(fix_results.values())
+                print_progress(f"成功修复 {success_count}/{len(fix_results)} 个问题")
             
-            return success_count == len(auto_fixable_issues)
+            return all(fix_results.values())
         
         return True
     
     def _print_summary(self, env_info: EnvironmentInfo):
-        """打印检查摘要"""
-        print("\n" + "="*50)
-        print("🔍 环境检查报告")
-        print("="*50)
-        
-        print(f"Python版本: {env_info.python_version}")
-        print(f"系统平台: {env_info.platform.value}")
-        print(f"项目根目录: {env_info.project_root}")
-        print(f"包管理器: {env_info.package_manager.value}")
+        """打印检查摘要（拼接完整报告后一次性输出）"""
+        lines = [_SUMMARY_HEADER_TEMPLATE.format_map({
+            "python_version": env_info.python_version,
+            "platform": env_info.platform.value,
+            "project_root": env_info.project_root,
+            "package_manager": env_info.package_manager.value,
+        })]
         
         # 显示错误
         if self.errors:
-            print("\n❌ 发现错误:")
+            lines.append("\n❌ 发现错误:")
             for error in self.errors:
-                print(f"  • {error.message}")
-                print(f"    解决方案: {error.solution}")
+                lines.append(f"  • {error.message}")
+                lines.append(f"    解决方案: {error.solution}")
                 
         # 显示警告
         if self.warnings:
-            print("\n⚠️  警告信息:")
+            lines.append("\n⚠️  警告信息:")
             for warning in self.warnings:
-                print(f"  • {warning.message}")
+                lines.append(f"  • {warning.message}")
                 if warning.auto_fixable:
-                    print(f"    将自动修复: {warning.solution}")
+                    lines.append(f"    将自动修复: {warning.solution}")
                     
         # 显示状态
         if env_info.is_ready:
-            print("\n✅ 环境检查通过，一切就绪！")
+            lines.append("\n✅ 环境检查通过，一切就绪！")
         else:
-            print("\n🔧 需要修复一些问题...")
+            lines.append("\n🔧 需要修复一些问题...")
             
-        print("="*50)
+        lines.append("="*50)
+        print("\n".join(lines))
     
     def get_errors(self) -> List[ErrorInfo]:
         """获取错误列表"""
@@ -276,16 +394,15 @@ class EnvChecker:
 
 def main():
     """主入口函数 - 用于独立运行环境检查"""
-    # 检查是否为首次运行
-    from .welcome_wizard import check_first_run, run_welcome_wizard_if_needed
-    
+    # 检查是否为首次运行（配置文件不存在），只在首次运行时才加载欢迎向导
     if check_first_run():
         # 首次运行，启动欢迎向导
+        from .welcome_wizard import run_welcome_wizard_if_needed
         success = run_welcome_wizard_if_needed()
         sys.exit(0 if success else 1)
     
-    # 常规环境检查
-    checker = EnvChecker(silent=False)
+    # 常规环境检查（--strict 时实际导入依赖包进行确认）
+    checker = EnvChecker(silent=False, strict="--strict" in sys.argv[1:])
     env_info = checker.check_all()
     
     if checker.has_critical_errors():
@@ -3,47 +3,60 @@
 Apple式设计：用户友好的错误处理，智能建议，一键修复
 """
 
+import re
 import sys
 import traceback
 from typing import List, Dict, Optional, Callable
 from .models import ErrorInfo
-from .utils import get_friendly_error_message
+
+
+# 严重程度 -> 图标
+_SEVERITY_ICONS = {
+    "error": "❌",
+    "warning": "⚠️",
+    "info": "ℹ️"
+}
+
+# 简化堆栈中需要显示的项目相关帧
+_RELEVANT_TB_RE = re.compile(r"portable|universal|gui")
 
 
 class ErrorHandler:
     """错误处理器 - Apple式设计：优雅处理，智能修复"""
     
-    def __init__(self):
-        self.error_handlers: Dict[str, Callable] = {}
-        self.auto_fix_handlers: Dict[str, Callable] = {}
-        self._register_default_handlers()
-    
-    def _register_default_handlers(self):
-        """注册默认错误处理器"""
+    # 默认错误处理器: 错误码 -> 方法名（类定义时构建一次）
+    _DEFAULT_HANDLERS = {
         # Python版本错误
-        self.register_error_handler("python_version", self._handle_python_version_error)
-        
+        "python_version": "_handle_python_version_error",
         # 包管理器错误
-        self.register_error_handler("uv_missing", self._handle_uv_missing)
-        self.register_error_handler("pip_missing", self._handle_pip_missing)
-        
+        "uv_missing": "_handle_uv_missing",
+        "pip_missing": "_handle_pip_missing",
         # 依赖错误
-        self.register_error_handler("dependency_missing", self._handle_dependency_missing)
-        self.register_auto_fix("dependency_missing", self._auto_fix_dependencies)
-        
+        "dependency_missing": "_handle_dependency_missing",
         # 配置错误
-        self.register_error_handler("config_missing", self._handle_config_missing)
-        self.register_auto_fix("config_missing", self._auto_fix_config)
-        
+        "config_missing": "_handle_config_missing",
         # 目录错误
-        self.register_error_handler("dir_missing", self._handle_dir_missing)
-        self.register_auto_fix("dir_missing", self._auto_fix_directories)
-        
+        "dir_missing": "_handle_dir_missing",
         # 权限错误
-        self.register_error_handler("permission_denied", self._handle_permission_error)
-        
+        "permission_denied": "_handle_permission_error",
         # 网络错误
-        self.register_error_handler("network_error", self._handle_network_error)
+        "network_error": "_handle_network_error",
+    }
+    
+    # 默认自动修复处理器: 错误码 -> 方法名
+    _DEFAULT_AUTO_FIX = {
+        "dependency_missing": "_auto_fix_dependencies",
+        "config_missing": "_auto_fix_config",
+        "dir_missing": "_auto_fix_directories",
+    }
+    
+    def __init__(self):
+        self.error_handlers: Dict[str, Callable] = {
+            code: getattr(self, name) for code, name in self._DEFAULT_HANDLERS.items()
+        }
+        self.auto_fix_handlers: Dict[str, Callable] = {
+            code: getattr(self, name) for code, name in self._DEFAULT_AUTO_FIX.items()
+        }
     
     def register_error_handler(self, error_code: str, handler: Callable):
         """注册错误处理器"""
@@ -62,9 +75,10 @@ class ErrorHandler:
             print(f"💡 解决方案: {error.solution}")
         
         # 如果有自定义处理器，调用它
-        if error.code in self.error_handlers:
+        handler = self.error_handlers.get(error.code)
+        if handler is not None:
             try:
-                return self.error_handlers[error.code](error)
+                return handler(error)
             except Exception as e:
                 print(f"⚠️  错误处理器执行失败: {str(e)}")
         
@@ -77,8 +91,7 @@ class ErrorHandler:
         if not errors:
             return results
         
-        print(f"\n🔧 发现 {len(errors)} 个问题，正在处理...")
-        print("=" * 50)
+        print(f"\n🔧 发现 {len(errors)} 个问题，正在处理...\n{'=' * 50}")
         
         for error in errors:
             print(f"\n处理问题: {error.code}")
@@ -104,12 +117,18 @@ class ErrorHandler:
         print(f"\n🔧 自动修复 {len(fixable_errors)} 个问题...")
         print("=" * 50)
         
+        # 同一错误码只修复一次（如多条dir_missing由一次目录创建全部修复）
+        first_by_code: Dict[str, ErrorInfo] = {}
         for error in fixable_errors:
+            first_by_code.setdefault(error.code, error)
+        
+        for error in first_by_code.values():
             print(f"\n修复问题: {error.code}")
             
-            if error.code in self.auto_fix_handlers:
+            fix_handler = self.auto_fix_handlers.get(error.code)
+            if fix_handler is not None:
                 try:
-                    success = self.auto_fix_handlers[error.code](error)
+                    success = fix_handler(error)
                     results[error.code] = success
                     
                     if success:
@@ -131,44 +150,39 @@ class ErrorHandler:
             print("\n✅ 没有发现问题")
             return
         
-        print(f"\n📋 问题摘要 ({len(errors)} 个问题)")
-        print("=" * 50)
-        
-        # 按严重程度分组
-        critical_errors = [e for e in errors if e.severity == "error"]
-        warnings = [e for e in errors if e.severity == "warning"]
-        infos = [e for e in errors if e.severity == "info"]
-        
-        if critical_errors:
-            print(f"\n❌ 严重错误 ({len(critical_errors)} 个):")
-            for error in critical_errors:
-                print(f"   • {error.message}")
+        # 按严重程度分组（单次遍历，同时收集可自动修复的问题）
+        critical_errors = []
+        warnings = []
+        infos = []
+        auto_fixable = []
+        buckets = {"error": critical_errors, "warning": warnings, "info": infos}
+        for error in errors:
+            bucket = buckets.get(error.severity)
+            if bucket is not None:
+                bucket.append(error)
+            if error.auto_fixable:
+                auto_fixable.append(error)
         
-        if warnings:
-            print(f"\n⚠️  警告 ({len(warnings)} 个):")
-            for error in warnings:
-                print(f"   • {error.message}")
+        # 先拼接完整摘要，再一次性输出
+        lines = [f"\n📋 问题摘要 ({len(errors)} 个问题)", "=" * 50]
         
-        if infos:
-            print(f"\nℹ️  信息 ({len(infos)} 个):")
-            for error in infos:
-                print(f"   • {error.message}")
+        for title, group in (
+            ("\n❌ 严重错误", critical_errors),
+            ("\n⚠️  警告", warnings),
+            ("\nℹ️  信息", infos),
+            # 显示可自动修复的问题
+            ("\n🔧 可自动修复", auto_fixable),
+        ):
+            if group:
+                lines.append(f"{title} ({len(group)} 个):")
+                lines.extend(f"   • {error.message}" for error in group)
         
-        # 显示可自动修复的问题
-        auto_fixable = [e for e in errors if e.auto_fixable]
-        if auto_fixable:
-            print(f"\n🔧 可自动修复 ({len(auto_fixable)} 个):")
-            for error in auto_fixable:
-                print(f"   • {error.message}")
+        print("\n".join(lines))
     
-    def _get_error_icon(self, severity: str) -> str:
+    @staticmethod
+    def _get_error_icon(severity: str) -> str:
         """获取错误图标"""
-        icons = {
-            "error": "❌",
-            "warning": "⚠️",
-            "info": "ℹ️"
-        }
-        return icons.get(severity, "❓")
+        return _SEVERITY_ICONS.get(severity, "❓")
     
     # 默认错误处理器实现
     def _handle_python_version_error(self, error: ErrorInfo) -> bool:
@@ -246,9 +260,9 @@ class ErrorHandler:
     def _auto_fix_config(self, error: ErrorInfo) -> bool:
         """自动修复配置问题"""
         try:
-            from .config_manager import ConfigManager
-            config_manager = ConfigManager(silent=False)
-            config_manager.create_default_config()
+            from .config_manager import get_config_manager
+            config_manager = get_config_manager(silent=False)
+            config_manager.create_and_save_default_config()
             return True
         except Exception:
             return False
@@ -270,7 +284,7 @@ global_error_handler = ErrorHandler()
 
 def handle_exception(exc_type, exc_value, exc_traceback):
     """全局异常处理器"""
-    if issubclass(exc_type, KeyboardInterrupt):
+    if exc_type is KeyboardInterrupt:
         # 用户中断，优雅退出
         print("\n\n👋 操作已取消")
         sys.exit(0)
@@ -289,10 +303,12 @@ def handle_exception(exc_type, exc_value, exc_traceback):
     
     # 显示简化的堆栈跟踪
     print("\n📍 错误位置:")
-    tb_lines = traceback.format_tb(exc_traceback)
+    # 只提取并格式化最后几帧（其余帧不做源码行查找）
+    last_frames = list(traceback.walk_tb(exc_traceback))[-3:]
+    tb_lines = traceback.StackSummary.extract(last_frames).format()
     if tb_lines:
-        # 只显示最后几行相关的堆栈
-        relevant_lines = [line for line in tb_lines[-3:] if 'portable' in line or 'universal' in line or 'gui' in line]
+        # 只显示相关的堆栈
+        relevant_lines = [line for line in tb_lines if _RELEVANT_TB_RE.search(line)]
         if relevant_lines:
             for line in relevant_lines:
                 print(f"   {line.strip()}")
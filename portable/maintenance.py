@@ -3,42 +3,98 @@
 Apple式设计：后台智能优化，预测性维护
 """
 
+import atexit
 import os
 import time
-import json
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from .path_manager import PathManager
-from .config_manager import ConfigManager
+from .config_manager import get_config_manager
 from .dep_manager import DependencyManager
-from .utils import print_progress
+from .utils import find_project_root, print_progress, loads_json, dumps_json, atomic_write_bytes
+
+
+# 清理空目录时保留的重要目录
+PROTECTED_DIR_NAMES = frozenset({"downloads", "logs", "cookies", "portable", "tests"})
+
+# 项目根目录下需要清理的临时文件后缀
+TEMP_FILE_SUFFIXES = (".tmp", ".temp", ".part", ".ytdl")
+
+# 后台维护检查间隔（秒）
+MAINTENANCE_INTERVAL = 3600
+
+# 自动清理和检查更新的间隔（秒）
+CLEANUP_INTERVAL = 7 * 86400
+UPDATE_CHECK_INTERVAL = 3 * 86400
+
+# 日志保留时间（秒）
+LOG_RETENTION = 30 * 86400
+
+# 日志文件数达到该值时并行清理
+PARALLEL_LOG_CLEANUP_THRESHOLD = 256
+
+
+def _purge_empty_dirs(path: str) -> bool:
+    """自底向上删除path下的空子目录，返回path本身清理后是否为空
+    
+    不进入隐藏目录（如.git、.venv），也不删除受保护的目录。
+    """
+    empty = True
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                    if _purge_empty_dirs(entry.path) and entry.name not in PROTECTED_DIR_NAMES:
+                        try:
+                            os.rmdir(entry.path)
+                            continue
+                        except OSError:
+                            pass
+                empty = False
+    except OSError:
+        return False
+    return empty
 
 
 class MaintenanceManager:
     """维护管理器 - Apple式后台智能优化"""
     
+    # 使用统计的最短写入间隔（秒）
+    SAVE_INTERVAL = 30.0
+    
     def __init__(self, silent: bool = True):
         self.silent = silent
         self.path_manager = PathManager(silent=True)
-        self.config_manager = ConfigManager(silent=True)
+        self.config_manager = get_config_manager(silent=True)
         self.dep_manager = DependencyManager(silent=True)
         
-        self.project_root = self.path_manager.get_project_root()
+        self.project_root = find_project_root()
         self.maintenance_file = self.project_root / ".maintenance.json"
         
         self.maintenance_data = self._load_maintenance_data()
         
+        # 使用统计先在内存中累积，按间隔合并写入（后台线程与主线程共享数据，需加锁）
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+        
+        # 后台线程等待事件：stop() 可立即唤醒并结束线程，不必等满一小时
+        self._wake = threading.Event()
+        self._stopped = False
+        atexit.register(self.stop)
+        
     def _load_maintenance_data(self) -> Dict:
         """加载维护数据"""
-        if self.maintenance_file.exists():
-            try:
-                with open(self.maintenance_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                pass
+        try:
+            return loads_json(self.maintenance_file.read_bytes())
+        except Exception:
+            pass
         
         # 默认维护数据
         return {
@@ -67,11 +123,19 @@ class MaintenanceManager:
     
     def _save_maintenance_data(self):
         """保存维护数据"""
-        try:
-            with open(self.maintenance_file, 'w', encoding='utf-8') as f:
-                json.dump(self.maintenance_data, f, indent=2, ensure_ascii=False)
-        except Exception:
-            pass
+        with self._lock:
+            self._last_flush = time.monotonic()
+            try:
+                atomic_write_bytes(self.maintenance_file, dumps_json(self.maintenance_data))
+                self._dirty = False
+            except Exception:
+                # 写入失败时保留未保存标记，下次保存或退出时的flush会重试
+                self._dirty = True
+    
+    def flush(self):
+        """写入尚未保存的维护数据（进程退出时自动调用）"""
+        if self._dirty:
+            self._save_maintenance_data()
     
     def run_background_maintenance(self):
         """运行后台维护任务"""
@@ -87,22 +151,28 @@ class MaintenanceManager:
     
     def _background_maintenance_worker(self):
         """后台维护工作线程"""
-        while True:
+        while not self._stopped:
+            # 每小时检查一次（可被 stop() 提前唤醒）
+            self._wake.wait(MAINTENANCE_INTERVAL)
+            self._wake.clear()
+            if self._stopped:
+                break
+            
             try:
-                # 每小时检查一次
-                time.sleep(3600)
+                # 写入累积的使用统计
+                self.flush()
                 
-                current_time = datetime.now().isoformat()
+                now = datetime.now()
                 
                 # 检查是否需要清理
                 if self._should_run_cleanup():
                     self._run_silent_cleanup()
-                    self.maintenance_data["last_cleanup"] = current_time
+                    self._mark_time("last_cleanup", now)
                 
                 # 检查是否需要更新检查
                 if self._should_check_updates():
                     self._check_for_updates()
-                    self.maintenance_data["last_update_check"] = current_time
+                    self._mark_time("last_update_check", now)
                 
                 # 优化缓存
                 if self._should_optimize_cache():
@@ -115,35 +185,46 @@ class MaintenanceManager:
                 # 静默处理错误，不影响主程序
                 pass
     
+    def stop(self):
+        """停止后台维护线程（进程退出时自动调用）"""
+        self._stopped = True
+        self._wake.set()
+    
+    def _mark_time(self, key: str, now: datetime):
+        """记录时间：ISO字符串便于阅读，*_ts 秒级时间戳用于比较"""
+        self.maintenance_data[key] = now.isoformat()
+        self.maintenance_data[f"{key}_ts"] = now.timestamp()
+    
+    def _seconds_since(self, key: str) -> Optional[float]:
+        """距上次记录时间的秒数，从未记录或无法解析时返回None"""
+        ts = self.maintenance_data.get(f"{key}_ts")
+        if ts is None:
+            # 兼容只有ISO字符串的旧数据，解析一次后缓存时间戳
+            iso = self.maintenance_data.get(key)
+            if not iso:
+                return None
+            try:
+                ts = datetime.fromisoformat(iso).timestamp()
+            except (TypeError, ValueError):
+                return None
+            self.maintenance_data[f"{key}_ts"] = ts
+        return time.time() - ts
+    
     def _should_run_cleanup(self) -> bool:
         """检查是否应该运行清理"""
         if not self.maintenance_data["optimization_settings"]["auto_cleanup"]:
             return False
         
-        last_cleanup = self.maintenance_data.get("last_cleanup")
-        if not last_cleanup:
-            return True
-        
-        try:
-            last_time = datetime.fromisoformat(last_cleanup)
-            return datetime.now() - last_time > timedelta(days=7)
-        except Exception:
-            return True
+        elapsed = self._seconds_since("last_cleanup")
+        return elapsed is None or elapsed > CLEANUP_INTERVAL
     
     def _should_check_updates(self) -> bool:
         """检查是否应该检查更新"""
         if not self.maintenance_data["optimization_settings"]["background_updates"]:
             return False
         
-        last_check = self.maintenance_data.get("last_update_check")
-        if not last_check:
-            return True
-        
-        try:
-            last_time = datetime.fromisoformat(last_check)
-            return datetime.now() - last_time > timedelta(days=3)
-        except Exception:
-            return True
+        elapsed = self._seconds_since("last_update_check")
+        return elapsed is None or elapsed > UPDATE_CHECK_INTERVAL
     
     def _should_optimize_cache(self) -> bool:
         """检查是否应该优化缓存"""
@@ -157,20 +238,14 @@ class MaintenanceManager:
             if logs_dir.exists():
                 self._cleanup_old_logs(logs_dir)
             
-            # 清理临时文件
-            temp_files = [
-                "*.tmp",
-                "*.temp",
-                "*.part",
-                "*.ytdl"
-            ]
-            
-            for pattern in temp_files:
-                for file in self.project_root.glob(pattern):
-                    try:
-                        file.unlink()
-                    except Exception:
-                        pass
+            # 清理临时文件（单次scandir匹配全部后缀）
+            with os.scandir(self.project_root) as it:
+                for entry in it:
+                    if entry.name.endswith(TEMP_FILE_SUFFIXES) and entry.is_file(follow_symlinks=False):
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
             
             # 清理空目录
             self._cleanup_empty_directories()
@@ -181,30 +256,36 @@ class MaintenanceManager:
     def _cleanup_old_logs(self, logs_dir: Path):
         """清理旧日志文件"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=30)
+            cutoff = time.time() - LOG_RETENTION
+            
+            with os.scandir(logs_dir) as it:
+                entries = [
+                    entry for entry in it
+                    if entry.name.endswith(".log") and entry.is_file(follow_symlinks=False)
+                ]
             
-            for log_file in logs_dir.glob("*.log"):
+            def remove_if_old(entry: os.DirEntry):
                 try:
-                    if log_file.stat().st_mtime < cutoff_date.timestamp():
-                        log_file.unlink()
-                except Exception:
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
                     pass
+            
+            # 日志很多时并行stat/删除，少量文件时线程池的开销不值得
+            if len(entries) >= PARALLEL_LOG_CLEANUP_THRESHOLD:
+                workers = min(8, (os.cpu_count() or 2) * 2)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(remove_if_old, entries, chunksize=64))
+            else:
+                for entry in entries:
+                    remove_if_old(entry)
         except Exception:
             pass
     
     def _cleanup_empty_directories(self):
-        """清理空目录"""
+        """清理空目录（自底向上，一次清理整条空目录链）"""
         try:
-            for root, dirs, files in os.walk(self.project_root):
-                for dir_name in dirs:
-                    dir_path = Path(root) / dir_name
-                    try:
-                        if not any(dir_path.iterdir()):
-                            # 不删除重要目录
-                            if dir_name not in ["downloads", "logs", "cookies", "portable", "tests"]:
-                                dir_path.rmdir()
-                    except Exception:
-                        pass
+            _purge_empty_dirs(str(self.project_root))
         except Exception:
             pass
     
@@ -235,25 +316,30 @@ class MaintenanceManager:
     def record_usage(self, platform: str, quality: str, download_time: float):
         """记录使用统计"""
         try:
-            stats = self.maintenance_data["usage_stats"]
-            
-            # 更新统计
-            stats["total_downloads"] += 1
-            stats["total_runtime"] += download_time
-            stats["last_used"] = datetime.now().isoformat()
-            
-            # 记录平台使用频率
-            if platform not in stats["favorite_platforms"]:
-                stats["favorite_platforms"][platform] = 0
-            stats["favorite_platforms"][platform] += 1
-            
-            # 记录质量偏好
-            if quality not in stats["common_qualities"]:
-                stats["common_qualities"][quality] = 0
-            stats["common_qualities"][quality] += 1
+            with self._lock:
+                stats = self.maintenance_data["usage_stats"]
+                
+                # 更新统计
+                stats["total_downloads"] += 1
+                stats["total_runtime"] += download_time
+                stats["last_used_ts"] = time.time()
+                
+                # 记录平台使用频率
+                if platform not in stats["favorite_platforms"]:
+                    stats["favorite_platforms"][platform] = 0
+                stats["favorite_platforms"][platform] += 1
+                
+                # 记录质量偏好
+                if quality not in stats["common_qualities"]:
+                    stats["common_qualities"][quality] = 0
+                stats["common_qualities"][quality] += 1
+                
+                self._dirty = True
+                save_due = time.monotonic() - self._last_flush >= self.SAVE_INTERVAL
             
-            # 保存数据
-            self._save_maintenance_data()
+            # 距上次写入超过间隔时才保存，连续下载合并为一次写入
+            if save_due:
+                self._save_maintenance_data()
             
         except Exception:
             pass
@@ -264,43 +350,48 @@ class MaintenanceManager:
             stats = self.maintenance_data["usage_stats"]
             
             # 分析最常用平台
+            favorite_platforms = stats["favorite_platforms"]
             favorite_platform = None
-            if stats["favorite_platforms"]:
-                favorite_platform = max(
-                    stats["favorite_platforms"].items(),
-                    key=lambda x: x[1]
-                )[0]
+            if favorite_platforms:
+                favorite_platform = max(favorite_platforms.items(), key=itemgetter(1))[0]
             
             # 分析最常用质量
+            common_qualities = stats["common_qualities"]
             preferred_quality = None
-            if stats["common_qualities"]:
-                preferred_quality = max(
-                    stats["common_qualities"].items(),
-                    key=lambda x: x[1]
-                )[0]
+            if common_qualities:
+                preferred_quality = max(common_qualities.items(), key=itemgetter(1))[0]
             
             return {
                 "total_downloads": stats["total_downloads"],
                 "favorite_platform": favorite_platform,
                 "preferred_quality": preferred_quality,
-                "last_used": stats["last_used"],
+                "last_used": self._format_last_used(stats),
                 "suggestions": self._generate_suggestions(stats)
             }
             
         except Exception:
             return {}
     
+    @staticmethod
+    def _format_last_used(stats: Dict) -> Optional[str]:
+        """最近使用时间（记录时只存时间戳，展示时再格式化）"""
+        ts = stats.get("last_used_ts")
+        if ts is None:
+            return stats.get("last_used")  # 旧数据只有ISO字符串
+        return datetime.fromtimestamp(ts).isoformat()
+    
     def _generate_suggestions(self, stats: Dict) -> List[str]:
         """生成智能建议"""
         suggestions = []
         
         try:
             # 基于使用频率的建议
+            favorite_platforms = stats.get("favorite_platforms", {})
             if stats["total_downloads"] > 10:
-                if "youtube" in stats.get("favorite_platforms", {}):
+                if "youtube" in favorite_platforms:
                     suggestions.append("💡 您经常下载YouTube视频，建议设置cookies以下载高质量内容")
                 
-                if stats.get("favorite_platforms", {}).get("pornhub", 0) > 5:
+                if favorite_platforms.get("pornhub", 0) > 5:
                     suggestions.append("🔒 建议为成人内容设置专门的下载目录")
             
             # 基于质量偏好的建议
@@ -330,7 +421,14 @@ class MaintenanceManager:
     def update_optimization_settings(self, settings: Dict):
         """更新优化设置"""
         try:
-            self.maintenance_data["optimization_settings"].update(settings)
+            current = self.maintenance_data["optimization_settings"]
+            changed = {k: v for k, v in settings.items() if current.get(k) != v}
+            
+            # 设置未变化时无需重写文件
+            if not changed:
+                return
+            
+            current.update(changed)
             self._save_maintenance_data()
         except Exception:
             pass
@@ -351,9 +449,9 @@ class MaintenanceManager:
             self._optimize_cache()
             
             # 更新维护时间
-            current_time = datetime.now().isoformat()
-            self.maintenance_data["last_cleanup"] = current_time
-            self.maintenance_data["last_update_check"] = current_time
+            now = datetime.now()
+            self._mark_time("last_cleanup", now)
+            self._mark_time("last_update_check", now)
             
             # 保存数据
             self._save_maintenance_data()
@@ -3,9 +3,11 @@
 定义可移植性模块使用的数据结构
 """
 
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 
@@ -69,9 +71,13 @@ class PortableConfig:
         }
 
 
-@dataclass
+# dataclass(slots=True) 需要 Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class ErrorInfo:
-    """错误信息模型"""
+    """错误信息模型（不可变、可哈希，便于去重）"""
     code: str
     message: str
     solution: str
@@ -85,11 +91,11 @@ class ErrorInfo:
 class ProjectStructure:
     """项目结构定义"""
     
-    REQUIRED_DIRS = [
+    REQUIRED_DIRS = (
         "downloads",
         "logs", 
         "cookies"
-    ]
+    )
     
     CONFIG_FILES = [
         "downloader_config.json",
@@ -104,17 +110,19 @@ class ProjectStructure:
     @classmethod
     def get_project_root(cls) -> Path:
         """获取项目根目录"""
-        current = Path(__file__).parent.parent
-        
-        # 检查是否包含主要脚本文件
-        for script in cls.MAIN_SCRIPTS:
-            if (current / script).exists():
-                return current.resolve()
-        
-        # 如果当前目录不是项目根目录，向上查找
-        for parent in current.parents:
-            if all((parent / script).exists() for script in cls.MAIN_SCRIPTS[:1]):
-                return parent.resolve()
-        
-        # 默认返回当前目录的父目录
-        return current.resolve()
\ No newline at end of file
+        return _locate_project_root(str(Path(__file__).parent.parent), tuple(cls.MAIN_SCRIPTS))
+
+
+def _locate_project_root(start: str, main_scripts: Tuple[str, ...]) -> Path:
+    """从起始目录向上查找项目根目录（结果由utils.find_project_root缓存）"""
+    current = Path(start)
+    
+    # 起始目录包含任一主要脚本即可，上级目录需包含主脚本
+    markers = main_scripts
+    for directory in (current, *current.parents):
+        if any(os.path.exists(os.path.join(directory, script)) for script in markers):
+            return directory.resolve()
+        markers = main_scripts[:1]
+    
+    # 默认返回起始目录
+    return current.resolve()
@@ -4,76 +4,117 @@ Apple式设计：智能路径处理，跨平台兼容，透明转换
 """
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 from .models import ErrorInfo, ProjectStructure
-from .utils import ensure_directory, get_friendly_error_message, print_progress
+from .utils import ensure_directory, find_project_root, get_friendly_error_message, print_progress
+
+
+# 连续的斜杠（标准化时合并为一个）
+_REPEATED_SLASHES_RE = re.compile(r'/{2,}')
+
+
+# 路径中的非法字符
+_ILLEGAL_PATH_CHARS_RE = re.compile(r'[<>:"|?*]')
+
+
+# 文件名非法字符替换表
+_SAFE_FILENAME_TABLE = str.maketrans({
+    '<': '(',
+    '>': ')',
+    ':': '-',
+    '"': "'",
+    '|': '-',
+    '?': None,
+    '*': None,
+    '/': '-',
+    '\\': '-'
+})
+
+
+# 路径转换结果缓存（按字符串缓存，resolve()需要逐级访问文件系统）
+@lru_cache(maxsize=512)
+def _resolve_relative_path(project_root: str, path: str) -> Path:
+    """将相对路径解析为绝对路径"""
+    path = Path(path)
+    
+    # 如果已经是绝对路径，直接返回
+    if path.is_absolute():
+        return path.resolve()
+    
+    # 相对于项目根目录解析
+    return (Path(project_root) / path).resolve()
+
+
+@lru_cache(maxsize=512)
+def _convert_to_relative(project_root: str, absolute_path: str) -> str:
+    """将绝对路径转换为相对于项目根目录的路径"""
+    absolute_path = Path(absolute_path)
+    
+    try:
+        # 尝试计算相对路径
+        relative = absolute_path.relative_to(project_root)
+        return str(relative).replace('\\', '/')  # 统一使用正斜杠
+    except ValueError:
+        # 如果路径不在项目根目录下，返回绝对路径
+        return str(absolute_path).replace('\\', '/')
+
+
+@lru_cache(maxsize=512)
+def _normalize_path(path: str) -> str:
+    """标准化路径格式（跨平台兼容）"""
+    # 统一使用正斜杠
+    normalized = path.replace('\\', '/')
+    
+    # 移除多余的斜杠
+    normalized = _REPEATED_SLASHES_RE.sub('/', normalized)
+    
+    # 移除末尾的斜杠（除非是根目录）
+    if normalized.endswith('/') and len(normalized) > 1:
+        normalized = normalized[:-1]
+    
+    return normalized
 
 
 class PathManager:
     """路径管理器 - Apple式设计：智能处理，透明转换"""
     
+    # 配置中需要标准化的路径字段
+    CONFIG_PATH_FIELDS = (
+        'default_output_dir',
+        'output_dir',
+        'logs_dir',
+        'cookies_dir',
+        'config_file'
+    )
+    
     def __init__(self, silent: bool = False):
         self.silent = silent
         self.errors: List[ErrorInfo] = []
         self._project_root = None
-        self._cache = {}  # 路径缓存
+        self._cache: Dict[str, str] = {}  # 路径标准化缓存: 原始路径 -> 标准化路径
     
     def get_project_root(self) -> Path:
         """获取项目根目录（带缓存）"""
         if self._project_root is None:
-            self._project_root = ProjectStructure.get_project_root()
+            self._project_root = find_project_root()
             if not self.silent:
                 print_progress(f"项目根目录: {self._project_root}")
         return self._project_root
     
     def resolve_relative_path(self, path: Union[str, Path]) -> Path:
         """将相对路径解析为绝对路径"""
-        if isinstance(path, str):
-            path = Path(path)
-        
-        # 如果已经是绝对路径，直接返回
-        if path.is_absolute():
-            return path.resolve()
-        
-        # 相对于项目根目录解析
-        project_root = self.get_project_root()
-        resolved = (project_root / path).resolve()
-        
-        return resolved
+        return _resolve_relative_path(str(self.get_project_root()), str(path))
     
     def convert_to_relative(self, absolute_path: Union[str, Path]) -> str:
         """将绝对路径转换为相对于项目根目录的路径"""
-        if isinstance(absolute_path, str):
-            absolute_path = Path(absolute_path)
-        
-        project_root = self.get_project_root()
-        
-        try:
-            # 尝试计算相对路径
-            relative = absolute_path.relative_to(project_root)
-            return str(relative).replace('\\', '/')  # 统一使用正斜杠
-        except ValueError:
-            # 如果路径不在项目根目录下，返回绝对路径
-            return str(absolute_path).replace('\\', '/')
+        return _convert_to_relative(str(self.get_project_root()), str(absolute_path))
     
     def normalize_path(self, path: Union[str, Path]) -> str:
         """标准化路径格式（跨平台兼容）"""
-        if isinstance(path, Path):
-            path = str(path)
-        
-        # 统一使用正斜杠
-        normalized = path.replace('\\', '/')
-        
-        # 移除多余的斜杠
-        while '//' in normalized:
-            normalized = normalized.replace('//', '/')
-        
-        # 移除末尾的斜杠（除非是根目录）
-        if normalized.endswith('/') and len(normalized) > 1:
-            normalized = normalized[:-1]
-        
-        return normalized
+        return _normalize_path(str(path))
     
     def ensure_directory_exists(self, path: Union[str, Path]) -> bool:
         """确保目录存在"""
@@ -116,69 +157,47 @@ class PathManager:
             print_progress("标准化配置路径...")
         
         normalized_config = config.copy()
+        cache = self._cache
         
-        # 需要处理的路径字段
-        path_fields = [
-            'default_output_dir',
-            'output_dir',
-            'logs_dir',
-            'cookies_dir',
-            'config_file'
-        ]
-        
-        for field in path_fields:
+        for field in self.CONFIG_PATH_FIELDS:
             if field in normalized_config:
                 original_path = normalized_config[field]
                 
+                # 同一路径值只计算一次（已标准化的值映射到自身）
+                cached = cache.get(original_path) if isinstance(original_path, str) else None
+                if cached is not None:
+                    normalized_config[field] = cached
+                    continue
+                
                 # 转换为相对路径
                 if os.path.isabs(original_path):
-                    normalized_config[field] = self.convert_to_relative(original_path)
+                    normalized = self.convert_to_relative(original_path)
                 else:
                     # 已经是相对路径，只需要标准化格式
-                    normalized_config[field] = self.normalize_path(original_path)
+                    normalized = self.normalize_path(original_path)
+                
+                cache[original_path] = cache[normalized] = normalized
+                normalized_config[field] = normalized
         
         return normalized_config
     
     def validate_path(self, path: Union[str, Path]) -> bool:
         """验证路径的有效性"""
         try:
-            if isinstance(path, str):
-                path = Path(path)
-            
-            # 检查路径是否包含非法字符
-            illegal_chars = ['<', '>', ':', '"', '|', '?', '*']
             path_str = str(path)
             
-            for char in illegal_chars:
-                if char in path_str:
-                    return False
-            
-            # 检查路径长度（Windows限制）
-            if len(path_str) > 260:
+            # 检查路径是否包含非法字符
+            if _ILLEGAL_PATH_CHARS_RE.search(path_str):
                 return False
             
-            return True
+            # 检查路径长度（Windows限制）
+            return len(path_str) <= 260
         except Exception:
             return False
     
     def get_safe_filename(self, filename: str) -> str:
         """获取安全的文件名（移除非法字符）"""
-        # 非法字符替换映射
-        replacements = {
-            '<': '(',
-            '>': ')',
-            ':': '-',
-            '"': "'",
-            '|': '-',
-            '?': '',
-            '*': '',
-            '/': '-',
-            '\\': '-'
-        }
-        
-        safe_name = filename
-        for illegal, replacement in replacements.items():
-            safe_name = safe_name.replace(illegal, replacement)
+        safe_name = filename.translate(_SAFE_FILENAME_TABLE)
         
         # 移除多余的空格和点
         safe_name = safe_name.strip('. ')
@@ -270,4 +289,8 @@ class PathManager:
     def clear_cache(self):
         """清除路径缓存"""
         self._cache.clear()
+        _resolve_relative_path.cache_clear()
+        _convert_to_relative.cache_clear()
+        _normalize_path.cache_clear()
+        find_project_root.cache_clear()
         self._project_root = None
\ No newline at end of file
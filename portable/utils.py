@@ -3,15 +3,26 @@
 提供可移植性模块的基础工具
 """
 
+import json
+import os
+import shutil
 import sys
 import platform
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from .models import SystemPlatform, ProjectStructure
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+@lru_cache(maxsize=1)
 def detect_system_platform() -> SystemPlatform:
-    """检测系统平台"""
+    """检测系统平台（进程内不会变化，结果缓存）"""
     system = platform.system().lower()
     
     if system == "windows":
@@ -37,11 +48,51 @@ def is_python_version_compatible(min_version: str = "3.8") -> bool:
     return (current.major, current.minor) >= (min_parts[0], min_parts[1])
 
 
+@lru_cache(maxsize=1)
 def find_project_root() -> Path:
-    """智能查找项目根目录"""
+    """智能查找项目根目录（结果缓存，进程内不会变化）"""
     return ProjectStructure.get_project_root()
 
 
+def check_first_run() -> bool:
+    """检查是否为首次运行（项目根目录下没有配置文件）"""
+    return not (find_project_root() / "downloader_config.json").exists()
+
+
+def loads_json(data: bytes) -> Any:
+    """解析UTF-8 JSON字节（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def dumps_json(obj: Any) -> bytes:
+    """序列化为带缩进的UTF-8 JSON字节（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """原子写入：先完整写入同目录临时文件，再替换（中途崩溃不会截断原文件）
+    
+    临时文件使用隐藏的唯一文件名，不会被维护任务按 *.tmp 清理，也不会与并发写入冲突。
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".partial")
+    try:
+        with open(fd, 'wb', buffering=1 << 16) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def ensure_directory(path: Path) -> bool:
     """确保目录存在"""
     try:
@@ -51,13 +102,19 @@ def ensure_directory(path: Path) -> bool:
         return False
 
 
+@lru_cache(maxsize=None)
 def is_command_available(command: str) -> bool:
-    """检查命令是否可用"""
+    """检查命令是否可用（结果缓存，安装新命令后需调用 cache_clear）"""
     import subprocess
     
+    # 先在PATH中查找，找不到时无需启动子进程
+    executable = shutil.which(command)
+    if executable is None:
+        return False
+    
     try:
         subprocess.run(
-            [command, "--version"], 
+            [executable, "--version"], 
             capture_output=True, 
             check=True,
             timeout=10
@@ -67,20 +124,22 @@ def is_command_available(command: str) -> bool:
         return False
 
 
+# 用户友好的错误信息（错误码 -> 提示）
+FRIENDLY_ERROR_MESSAGES = {
+    "python_version": "Python版本过低，需要3.8或更高版本",
+    "uv_missing": "uv包管理器未安装，将使用pip作为备选",
+    "pip_missing": "pip包管理器不可用，请检查Python安装",
+    "config_missing": "配置文件缺失，将自动创建默认配置",
+    "dir_missing": "必要目录缺失，将自动创建",
+    "dependency_missing": "依赖包缺失，将自动安装",
+    "permission_denied": "权限不足，请以管理员身份运行",
+    "network_error": "网络连接问题，请检查网络设置"
+}
+
+
 def get_friendly_error_message(error_code: str) -> str:
     """获取用户友好的错误信息"""
-    error_messages = {
-        "python_version": "Python版本过低，需要3.8或更高版本",
-        "uv_missing": "uv包管理器未安装，将使用pip作为备选",
-        "pip_missing": "pip包管理器不可用，请检查Python安装",
-        "config_missing": "配置文件缺失，将自动创建默认配置",
-        "dir_missing": "必要目录缺失，将自动创建",
-        "dependency_missing": "依赖包缺失，将自动安装",
-        "permission_denied": "权限不足，请以管理员身份运行",
-        "network_error": "网络连接问题，请检查网络设置"
-    }
-    
-    return error_messages.get(error_code, "未知错误，请联系技术支持")
+    return FRIENDLY_ERROR_MESSAGES.get(error_code, "未知错误，请联系技术支持")
 
 
 def print_welcome_message():
@@ -106,6 +106,7 @@ class VenvManager:
                     text=True,
                     timeout=60
                 )
+                is_command_available.cache_clear()
                 if not is_command_available("uv"):
                     return False
             except:
@@ -5,19 +5,18 @@ Apple式设计：首次运行的优雅体验
 
 import os
 import sys
-from pathlib import Path
 from typing import Dict, Any
-from .config_manager import ConfigManager
+from .config_manager import get_config_manager
 from .env_checker import EnvChecker
 from .dep_manager import DependencyManager
-from .utils import print_progress
+from .utils import check_first_run, print_progress
 
 
 class WelcomeWizard:
     """欢迎向导 - Apple式首次运行体验"""
     
     def __init__(self):
-        self.config_manager = ConfigManager(silent=False)
+        self.config_manager = get_config_manager(silent=False)
         self.env_checker = EnvChecker(silent=False)
         self.dep_manager = DependencyManager(silent=False)
         
@@ -136,7 +135,7 @@ class WelcomeWizard:
             print("⚠️  pyproject.toml 生成失败，将使用 requirements.txt")
         
         # 创建默认配置
-        config = self.config_manager.create_default_config()
+        config = self.config_manager.create_and_save_default_config()
         if config:
             print("✅ 已创建默认配置文件")
             
@@ -240,15 +239,6 @@ class WelcomeWizard:
             sys.exit(0)
 
 
-def check_first_run() -> bool:
-    """检查是否为首次运行"""
-    project_root = Path(__file__).parent.parent
-    config_file = project_root / "downloader_config.json"
-    
-    # 如果配置文件不存在，认为是首次运行
-    return not config_file.exists()
-
-
 def run_welcome_wizard_if_needed() -> bool:
     """如果需要，运行欢迎向导"""
     if check_first_run():
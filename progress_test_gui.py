@@ -403,7 +403,8 @@ class ProgressTestDownloader(QMainWindow):
             self.current_task_id = task_id
             print(f"✅ Task added: {task_id}")
 
-            # 获取任务信息
+            # 获取任务信息（等待后台信息获取完成）
+            self.downloader.wait_for_info(task_id)
             task = self.downloader.get_task_status(task_id)
             if task and task.title:
                 print(f"📺 Video title: {task.title}")
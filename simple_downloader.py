@@ -128,6 +128,7 @@ class SimpleDownloader:
             # Get video info first
             print("  Getting video information...")
             task_id = self.manager.add_task(url, str(self.downloads_dir), audio_only=audio_only)
+            self.manager.wait_for_info(task_id)
             task = self.manager.get_task_status(task_id)
             
             print(f"  Title: {task.title}")
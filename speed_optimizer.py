@@ -211,8 +211,9 @@ class HighSpeedDownloader(DownloadManager):
                     task.error_message = str(e)
                     return False
         
-        # Replace extractor download method
+        # Replace extractor download method; batched downloads would bypass it
         self.extractor.download = optimized_download
+        self.extractor.batch_downloads = False
     
     def _get_speed_optimized_format(self, task):
         """Get format string optimized for speed"""
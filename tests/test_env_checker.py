@@ -0,0 +1,48 @@
+"""环境检查结果缓存测试"""
+
+from portable import error_handler
+from portable.env_checker import EnvChecker
+from portable.models import ProjectStructure
+
+
+def _make_checker(project_root):
+    checker = EnvChecker(silent=True)
+    checker.project_root = project_root
+    return checker
+
+
+def _fake_auto_fix(project_root):
+    """代替全局错误处理器：在临时项目目录中创建配置文件和必要目录"""
+    def auto_fix_errors(errors):
+        (project_root / "downloader_config.json").write_text("{}", encoding="utf-8")
+        for dir_name in ProjectStructure.REQUIRED_DIRS:
+            (project_root / dir_name).mkdir(exist_ok=True)
+        return {error.code: True for error in errors}
+    return auto_fix_errors
+
+
+def _assert_fixed(env_info):
+    assert env_info.config_status
+    assert all(env_info.directories_status.values())
+
+
+def test_recheck_after_auto_fix_is_clean(tmp_path, monkeypatch):
+    monkeypatch.setattr(error_handler.global_error_handler, "auto_fix_errors", _fake_auto_fix(tmp_path))
+    EnvChecker.clear_result_cache()
+
+    checker = _make_checker(tmp_path)
+    env_info = checker.check_all()
+    assert not env_info.config_status
+    assert not any(env_info.directories_status.values())
+
+    checker.auto_fix_issues()
+
+    # 同一实例重新检查
+    _assert_fixed(checker.check_all())
+
+    # 新实例（可能命中进程内共享的结果缓存）
+    fresh = _make_checker(tmp_path)
+    _assert_fixed(fresh.check_all())
+    codes = {warning.code for warning in fresh.warnings}
+    assert "config_missing" not in codes
+    assert "dir_missing" not in codes
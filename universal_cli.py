@@ -51,6 +51,7 @@ class DownloadCLI:
             
             # Add task
             task_id = self.manager.add_task(url, output_dir, **kwargs)
+            self.manager.wait_for_info(task_id)
             task = self.manager.get_task_status(task_id)
             
             print(f"Preparing download: {task.title}")
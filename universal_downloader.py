@@ -6,19 +6,72 @@ Architecture inspired by Hitomi-Downloader
 """
 
 import os
+import re
 import sys
 import json
 import threading
 import queue
+import secrets
+import subprocess
+import tempfile
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def _loads_config(data: bytes) -> Dict[str, Any]:
+    """Parse UTF-8 JSON config bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _read_bytes(file_path: str) -> bytes:
+    """Read a small file with raw os calls, without building a text file object"""
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+def _dumps_config(config: Dict[str, Any]) -> bytes:
+    """Serialize config to pretty-printed UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+class DownloadStatus(str, Enum):
+    """Download status enum"""
+    PENDING = "pending"
+    DOWNLOADING = "downloading" 
+    COMPLETED = "completed"
+    FAILED = "failed"
+    PAUSED = "paused"
+
+
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DownloadTask:
     """Download task data class"""
     url: str
@@ -29,23 +82,36 @@ class DownloadTask:
     task_id: str = None
     platform: str = None
     title: str = ""
-    status: str = "pending"  # pending, downloading, completed, failed
+    status: DownloadStatus = DownloadStatus.PENDING
     progress: float = 0.0
     file_path: str = ""
     error_message: str = ""
     
     def __post_init__(self):
         if not self.task_id:
-            self.task_id = f"{int(time.time())}_{hash(self.url) % 10000}"
+            self.task_id = f"{int(time.time())}_{secrets.token_hex(4)}"
 
 
-class DownloadStatus(Enum):
-    """Download status enum"""
-    PENDING = "pending"
-    DOWNLOADING = "downloading" 
-    COMPLETED = "completed"
-    FAILED = "failed"
-    PAUSED = "paused"
+@lru_cache(maxsize=None)
+def _load_yt_dlp():
+    """Import yt-dlp once per process, installing it on first use if missing"""
+    try:
+        import yt_dlp
+    except ImportError:
+        print("Installing yt-dlp...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "yt-dlp"], check=True)
+        import yt_dlp
+    return yt_dlp
+
+
+def _compile_platform_patterns(platform_patterns: Dict[str, List[str]]) -> "re.Pattern":
+    """Build one regex whose named groups are the platform names"""
+    alternatives = [
+        f"(?P<{platform}>{'|'.join(re.escape(p) for p in patterns)})"
+        for platform, patterns in platform_patterns.items()
+        if patterns
+    ]
+    return re.compile('|'.join(alternatives), re.IGNORECASE)
 
 
 class PlatformDetector:
@@ -62,24 +128,28 @@ class PlatformDetector:
         'generic': []  # Generic handler
     }
     
+    _PLATFORM_RE = _compile_platform_patterns(PLATFORM_PATTERNS)
+    
     @classmethod
     def detect_platform(cls, url: str) -> str:
         """Detect platform from URL"""
-        url_lower = url.lower()
-        
-        for platform, patterns in cls.PLATFORM_PATTERNS.items():
-            if platform == 'generic':
-                continue
-            for pattern in patterns:
-                if pattern in url_lower:
-                    return platform
-        
-        return 'generic'
+        return cls._detect_platform_cached(url)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _detect_platform_cached(url: str) -> str:
+        """Cached regex lookup - the same URL is classified several times per task"""
+        match = PlatformDetector._PLATFORM_RE.search(url)
+        return match.lastgroup if match else 'generic'
 
 
 class BaseExtractor:
     """Base extractor class"""
     
+    # Whether download_batch may be used for tasks sharing a batch_key. Set it to
+    # False when overriding download() so that every task goes through it.
+    batch_downloads = False
+    
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         
@@ -90,11 +160,25 @@ class BaseExtractor:
     def download(self, task: DownloadTask, progress_callback=None) -> bool:
         """Download video"""
         raise NotImplementedError
+    
+    def download_batch(self, tasks: List[DownloadTask], progress_callback=None) -> Dict[str, bool]:
+        """Download several videos that share the same batch_key"""
+        return {task.task_id: self.download(task, progress_callback) for task in tasks}
+    
+    @staticmethod
+    def batch_key(task: DownloadTask) -> tuple:
+        """Tasks with equal keys can be downloaded with identical options"""
+        return (task.output_dir, task.quality, task.format_type, task.audio_only,
+                PlatformDetector.detect_platform(task.url))
 
 
 class YtDlpExtractor(BaseExtractor):
     """yt-dlp based universal extractor"""
     
+    INFO_CACHE_TTL = 300  # seconds
+    batch_downloads = True
+    INFO_CACHE_SIZE = 1024
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
 
@@ -103,20 +187,41 @@ class YtDlpExtractor(BaseExtractor):
         self.fragment_retries = self.config.get('fragment_retries', 10)
         self.chunk_size = self.config.get('http_chunk_size', 10485760)  # 10MB
 
+        # 复用YoutubeDL实例 (按线程+参数缓存，YoutubeDL本身不是线程安全的)
+        self._ydl_cache = {}
+        self._ydl_lock = threading.Lock()
+
+        # url -> (expiry time, info) 的LRU缓存，避免重复添加同一URL时再次请求网络
+        self._info_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._info_lock = threading.Lock()
+
         self._check_dependencies()
         self._setup_cookies()
         
     def _check_dependencies(self):
         """Check yt-dlp dependencies"""
-        try:
-            import yt_dlp
-            self.yt_dlp = yt_dlp
-        except ImportError:
-            print("Installing yt-dlp...")
-            import subprocess
-            subprocess.run([sys.executable, "-m", "pip", "install", "yt-dlp"], check=True)
-            import yt_dlp
-            self.yt_dlp = yt_dlp
+        self.yt_dlp = _load_yt_dlp()
+    
+    def _get_ydl(self, ydl_opts: Dict[str, Any]):
+        """Return a warm YoutubeDL instance for these options on the current thread"""
+        key = (threading.get_ident(), frozenset(ydl_opts.items()))
+        with self._ydl_lock:
+            ydl = self._ydl_cache.get(key)
+            if ydl is None:
+                ydl = self.yt_dlp.YoutubeDL(ydl_opts)
+                self._ydl_cache[key] = ydl
+        return ydl
+    
+    def close(self):
+        """Close all cached YoutubeDL instances"""
+        with self._ydl_lock:
+            instances = list(self._ydl_cache.values())
+            self._ydl_cache.clear()
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception:
+                pass
     
     def _setup_cookies(self):
         """Setup cookies for authentication"""
@@ -166,63 +271,115 @@ class YtDlpExtractor(BaseExtractor):
             raise
 
     def extract_info(self, url: str) -> Dict[str, Any]:
-        """Extract video information"""
+        """Extract video information (cached per URL for INFO_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        with self._info_lock:
+            cached = self._info_cache.get(url)
+            if cached is not None and cached[0] > now:
+                self._info_cache.move_to_end(url)
+                return dict(cached[1])
+        
+        info = self._fetch_info(url)
+        
+        with self._info_lock:
+            self._info_cache[url] = (now + self.INFO_CACHE_TTL, info)
+            self._info_cache.move_to_end(url)
+            while len(self._info_cache) > self.INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+        return dict(info)
+    
+    def _fetch_info(self, url: str) -> Dict[str, Any]:
+        """Fetch video information from the network"""
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
         }
         
-        with self.yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                return {
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'view_count': info.get('view_count', 0),
-                    'formats': info.get('formats', []),
-                    'thumbnail': info.get('thumbnail', ''),
-                    'description': info.get('description', ''),
-                    'upload_date': info.get('upload_date', ''),
-                    'platform': PlatformDetector.detect_platform(url)
-                }
-            except Exception as e:
-                raise Exception(f"Info extraction failed: {str(e)}")
+        ydl = self._get_ydl(ydl_opts)
+        try:
+            info = ydl.extract_info(url, download=False)
+            return {
+                'title': info.get('title', 'Unknown'),
+                'duration': info.get('duration', 0),
+                'uploader': info.get('uploader', 'Unknown'),
+                'view_count': info.get('view_count', 0),
+                'formats': info.get('formats', []),
+                'thumbnail': info.get('thumbnail', ''),
+                'description': info.get('description', ''),
+                'upload_date': info.get('upload_date', ''),
+                'platform': PlatformDetector.detect_platform(url)
+            }
+        except Exception as e:
+            raise Exception(f"Info extraction failed: {str(e)}")
     
     def download(self, task: DownloadTask, progress_callback=None) -> bool:
         """Download video"""
+        return self.download_batch([task], progress_callback)[task.task_id]
+    
+    def download_batch(self, tasks: List[DownloadTask], progress_callback=None) -> Dict[str, bool]:
+        """Download several videos through one YoutubeDL instance
+        
+        All tasks must share the same download options (see batch_key);
+        the session, cookie jar and extractor registry are set up once.
+        """
+        current = {'task': tasks[0]}
+        
         def progress_hook(d):
             if progress_callback and d['status'] == 'downloading':
                 if 'total_bytes' in d:
                     progress = (d['downloaded_bytes'] / d['total_bytes']) * 100
-                    progress_callback(task.task_id, progress, d.get('speed', 0))
+                    progress_callback(current['task'].task_id, progress, d.get('speed', 0))
         
-        # Set output template
-        output_template = str(Path(task.output_dir) / '%(title)s.%(ext)s')
+        ydl_opts = self._build_ydl_opts(tasks[0])
+        ydl_opts['progress_hooks'] = [progress_hook]
         
+        results = {}
+        with self.yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            for task in tasks:
+                current['task'] = task
+                try:
+                    ydl.download([task.url])
+                    results[task.task_id] = True
+                except Exception as e:
+                    task.error_message = str(e)
+                    results[task.task_id] = False
+        return results
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _format_options(quality: str, format_type: str, audio_only: bool) -> tuple:
+        """Format selector and postprocessor templates for a task shape"""
         # Adjust format selector based on platform and requirements
-        if task.audio_only:
+        if audio_only:
             format_selector = 'bestaudio/best'
-            postprocessors = [{
+            postprocessors = (MappingProxyType({
                 'key': 'FFmpegExtractAudio',
                 'preferredcodec': 'mp3',
                 'preferredquality': '192',
-            }]
+            }),)
         else:
-            if task.quality == 'best':
-                format_selector = f'best[ext={task.format_type}]/best'
-            elif task.quality == 'worst':
-                format_selector = f'worst[ext={task.format_type}]/worst'
+            if quality == 'best':
+                format_selector = f'best[ext={format_type}]/best'
+            elif quality == 'worst':
+                format_selector = f'worst[ext={format_type}]/worst'
             else:
-                format_selector = f'best[height<={task.quality}][ext={task.format_type}]/best[height<={task.quality}]/best'
-            postprocessors = []
+                format_selector = f'best[height<={quality}][ext={format_type}]/best[height<={quality}]/best'
+            postprocessors = ()
+        return format_selector, postprocessors
+    
+    def _build_ydl_opts(self, task: DownloadTask) -> Dict[str, Any]:
+        """Build yt-dlp download options for a task (without progress hooks)"""
+        # Set output template
+        output_template = str(Path(task.output_dir) / '%(title)s.%(ext)s')
+        
+        format_selector, postprocessors = self._format_options(
+            task.quality, task.format_type, task.audio_only)
         
         ydl_opts = {
             'outtmpl': output_template,
             'format': format_selector,
             'noplaylist': True,
-            'progress_hooks': [progress_hook],
-            'postprocessors': postprocessors,
+            'postprocessors': [dict(pp) for pp in postprocessors],
             # 并发分片下载优化
             'concurrent_fragment_downloads': self.concurrent_fragments,
             'fragment_retries': self.fragment_retries,
@@ -274,26 +431,35 @@ class YtDlpExtractor(BaseExtractor):
             #     ydl_opts['cookiesfrombrowser'] = ('chrome', )
             print(f"🚫 Disabled browser cookie extraction for {platform}")
         
-        with self.yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                ydl.download([task.url])
-                return True
-            except Exception as e:
-                task.error_message = str(e)
-                return False
+        return ydl_opts
 
 
 class DownloadManager:
     """Download manager with multi-threading support"""
     
+    # Metadata fetches are mostly network waits, so they get their own pool sized
+    # like ThreadPoolExecutor's I/O default; downloads stay capped by max_workers
+    # since each one already runs concurrent fragment threads inside yt-dlp
+    INFO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+    
+    # Progress updates closer than both thresholds are coalesced
+    PROGRESS_MIN_DELTA = 0.5  # percent
+    PROGRESS_MIN_INTERVAL = 0.1  # seconds
+    
     def __init__(self, max_workers: int = 4, config_file: str = None):
         self.max_workers = max_workers
         self.config_file = config_file or "downloader_config.json"
         self.tasks: Dict[str, DownloadTask] = {}
         self.download_queue = queue.Queue()
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.info_executor = ThreadPoolExecutor(max_workers=self.INFO_WORKERS,
+                                                thread_name_prefix='info')
         self.running = False
         self.progress_callbacks = []
+        self.info_ready_callbacks = []
+        self._info_futures: Dict[str, Future] = {}  # task_id -> pending info prefetch
+        self.progress_events = deque(maxlen=1024)  # (task_id, progress, speed) for polling UIs
+        self._last_progress: Dict[str, tuple] = {}  # task_id -> (progress, monotonic time)
         
         # Load configuration
         self.config = self._load_config()
@@ -305,17 +471,15 @@ class DownloadManager:
         """Load configuration file"""
         # 使用可移植配置管理器
         try:
-            from portable.config_manager import ConfigManager
-            config_manager = ConfigManager(silent=True)
+            from portable.config_manager import get_config_manager
+            config_manager = get_config_manager(silent=True)
             return config_manager.load_config(self.config_file)
         except ImportError:
             # 回退到原始方式
-            if os.path.exists(self.config_file):
-                try:
-                    with open(self.config_file, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                except Exception:
-                    pass
+            try:
+                return _loads_config(_read_bytes(self.config_file))
+            except Exception:
+                pass
             
             # Default configuration
             default_config = {
@@ -352,8 +516,29 @@ class DownloadManager:
     def _save_config(self, config: Dict[str, Any]):
         """Save configuration file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            data = _dumps_config(config)
+            
+            # Skip the write when nothing changed on disk
+            try:
+                if Path(self.config_file).read_bytes() == data:
+                    return
+            except OSError:
+                pass
+            
+            # Unique hidden temp name: not matched by the *.tmp cleanup in portable.maintenance
+            config_path = Path(self.config_file).resolve()
+            fd, temp_file = tempfile.mkstemp(dir=config_path.parent,
+                                             prefix=f".{config_path.name}.", suffix=".partial")
+            try:
+                with open(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_file, config_path)
+            except BaseException:
+                try:
+                    os.unlink(temp_file)
+                except OSError:
+                    pass
+                raise
         except Exception as e:
             print(f"Config save failed: {e}")
     
@@ -365,6 +550,16 @@ class DownloadManager:
         """Notify progress update"""
         if task_id in self.tasks:
             self.tasks[task_id].progress = progress
+        
+        # yt-dlp fires the hook for every chunk; only forward meaningful changes
+        now = time.monotonic()
+        last = self._last_progress.get(task_id)
+        if (last is not None and progress < 100
+                and progress - last[0] < self.PROGRESS_MIN_DELTA
+                and now - last[1] < self.PROGRESS_MIN_INTERVAL):
+            return
+        self._last_progress[task_id] = (progress, now)
+        self.progress_events.append((task_id, progress, speed))
             
         for callback in self.progress_callbacks:
             try:
@@ -372,8 +567,45 @@ class DownloadManager:
             except Exception:
                 pass
     
+    def drain_progress_events(self) -> List[tuple]:
+        """Pop all pending (task_id, progress, speed) events, oldest first"""
+        events = []
+        while True:
+            try:
+                events.append(self.progress_events.popleft())
+            except IndexError:
+                return events
+    
+    def add_info_ready_callback(self, callback):
+        """Add callback fired once a task's video info has been fetched"""
+        self.info_ready_callbacks.append(callback)
+    
+    def _notify_info_ready(self, task_id: str, info: Dict[str, Any]):
+        """Notify that video info is available for a task"""
+        for callback in self.info_ready_callbacks:
+            try:
+                callback(task_id, info)
+            except Exception:
+                pass
+    
+    def _prefetch_info(self, task: DownloadTask) -> Optional[Dict[str, Any]]:
+        """Fetch video info in the background and fill in the task title"""
+        try:
+            info = self.extractor.extract_info(task.url)
+        except Exception as e:
+            print(f"Info extraction failed: {e}")
+            return None
+        
+        task.title = info.get('title', 'Unknown')
+        self._notify_info_ready(task.task_id, info)
+        return info
+    
     def add_task(self, url: str, output_dir: str = None, **kwargs) -> str:
-        """Add download task"""
+        """Add download task
+        
+        Returns immediately; the title is filled in by a background
+        prefetch (see add_info_ready_callback, or wait_for_info to block).
+        """
         output_dir = output_dir or self.config.get('default_output_dir', './downloads')
         
         task = DownloadTask(
@@ -392,23 +624,33 @@ class DownloadManager:
         if not platform_config.get('enabled', True):
             raise Exception(f"Platform {task.platform} is disabled")
         
-        # Extract basic information
-        try:
-            info = self.extractor.extract_info(url)
-            task.title = info.get('title', 'Unknown')
-        except Exception as e:
-            print(f"Info extraction failed: {e}")
-        
         self.tasks[task.task_id] = task
+        
+        # Extract basic information off the caller's thread
+        self._info_futures[task.task_id] = self.info_executor.submit(self._prefetch_info, task)
         return task.task_id
     
+    def wait_for_info(self, task_id: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Block until the task's info prefetch finishes
+        
+        Returns the video info, or None if extraction failed or the task is unknown.
+        """
+        future = self._info_futures.get(task_id)
+        if future is None:
+            return None
+        return future.result(timeout)
+    
+    def add_tasks(self, urls: List[str], output_dir: str = None, **kwargs) -> List[str]:
+        """Add several download tasks, fetching their info concurrently"""
+        return [self.add_task(url, output_dir, **kwargs) for url in urls]
+    
     def start_download(self, task_id: str):
         """Start download task"""
         if task_id not in self.tasks:
             raise ValueError(f"Task {task_id} does not exist")
         
         task = self.tasks[task_id]
-        task.status = DownloadStatus.DOWNLOADING.value
+        task.status = DownloadStatus.DOWNLOADING
         
         # Create output directory
         os.makedirs(task.output_dir, exist_ok=True)
@@ -417,21 +659,71 @@ class DownloadManager:
         future = self.executor.submit(self._download_task, task)
         return future
     
+    def start_downloads(self, task_ids: List[str]) -> list:
+        """Start several tasks, sharing one yt-dlp session per group of identical options
+        
+        Each group is split into at most max_workers sub-batches so the groups
+        still download in parallel. Returns one future per sub-batch; each
+        resolves to {task_id: success}.
+        """
+        buckets: Dict[tuple, List[DownloadTask]] = {}
+        for task_id in task_ids:
+            if task_id not in self.tasks:
+                raise ValueError(f"Task {task_id} does not exist")
+            task = self.tasks[task_id]
+            buckets.setdefault(self.extractor.batch_key(task), []).append(task)
+        
+        # Extractors that cannot batch (or whose download() is overridden) get one task per job
+        per_task = not self.extractor.batch_downloads
+        
+        futures = []
+        for bucket in buckets.values():
+            for task in bucket:
+                task.status = DownloadStatus.DOWNLOADING
+            os.makedirs(bucket[0].output_dir, exist_ok=True)
+            
+            parts = len(bucket) if per_task else min(self.max_workers, len(bucket))
+            for i in range(parts):
+                futures.append(self.executor.submit(self._batch_download, bucket[i::parts]))
+        return futures
+    
+    def _finish_task(self, task: DownloadTask, success: bool):
+        """Record the final status of a task"""
+        if success:
+            task.status = DownloadStatus.COMPLETED
+            task.progress = 100.0
+        else:
+            task.status = DownloadStatus.FAILED
+    
     def _download_task(self, task: DownloadTask):
         """Execute download task"""
         try:
             success = self.extractor.download(task, self._notify_progress)
-            if success:
-                task.status = DownloadStatus.COMPLETED.value
-                task.progress = 100.0
-            else:
-                task.status = DownloadStatus.FAILED.value
+            self._finish_task(task, success)
             return success
         except Exception as e:
-            task.status = DownloadStatus.FAILED.value
+            task.status = DownloadStatus.FAILED
             task.error_message = str(e)
             return False
     
+    def _batch_download(self, tasks: List[DownloadTask]) -> Dict[str, bool]:
+        """Execute a group of download tasks with shared options"""
+        try:
+            if len(tasks) == 1:
+                task = tasks[0]
+                results = {task.task_id: self.extractor.download(task, self._notify_progress)}
+            else:
+                results = self.extractor.download_batch(tasks, self._notify_progress)
+        except Exception as e:
+            for task in tasks:
+                task.status = DownloadStatus.FAILED
+                task.error_message = str(e)
+            return {task.task_id: False for task in tasks}
+        
+        for task in tasks:
+            self._finish_task(task, results[task.task_id])
+        return results
+    
     def get_task_status(self, task_id: str) -> Optional[DownloadTask]:
         """Get task status"""
         return self.tasks.get(task_id)
@@ -444,6 +736,8 @@ class DownloadManager:
         """Remove task"""
         if task_id in self.tasks:
             del self.tasks[task_id]
+        self._last_progress.pop(task_id, None)
+        self._info_futures.pop(task_id, None)
     
     def get_supported_platforms(self) -> List[str]:
         """Get supported platforms list"""
@@ -451,7 +745,9 @@ class DownloadManager:
     
     def shutdown(self):
         """Shutdown download manager"""
+        self.info_executor.shutdown(wait=True, cancel_futures=True)
         self.executor.shutdown(wait=True)
+        self.extractor.close()
 
 
 # Convenience functions